@@ -11,6 +11,7 @@ try:
         DevHandler,
         ensure_page_exists,
         find_free_port,
+        get_cached_page_bytes,
         main as _main,
     )
 except ModuleNotFoundError:  # pragma: no cover - fallback for local runs
@@ -24,6 +25,7 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for local runs
         DevHandler,
         ensure_page_exists,
         find_free_port,
+        get_cached_page_bytes,
         main as _main,
     )
 
@@ -32,6 +34,7 @@ __all__ = [
     "DevHandler",
     "ensure_page_exists",
     "find_free_port",
+    "get_cached_page_bytes",
     "main",
 ]
 
@@ -1,34 +1,61 @@
-import argparse, pathlib
+import argparse
+import multiprocessing
+import os
+import pathlib
+
 from rjsmin import jsmin
 
 
-def minify_file(src_path: pathlib.Path, dst_path: pathlib.Path):
+def minify_file(src_path: pathlib.Path, dst_path: pathlib.Path) -> bool:
+    """Minify src_path into dst_path; returns False if dst_path was already up to date."""
+    try:
+        if os.stat(dst_path).st_mtime_ns >= os.stat(src_path).st_mtime_ns:
+            return False
+    except FileNotFoundError:
+        pass
     dst_path.parent.mkdir(parents=True, exist_ok=True)
-    with src_path.open("r", encoding="utf-8") as f:
+    # rjsmin works on bytes directly; skip the UTF-8 decode/encode round trip
+    with src_path.open("rb") as f:
         code = f.read()
-    with dst_path.open("w", encoding="utf-8") as f:
+    with dst_path.open("wb") as f:
         f.write(jsmin(code))
+    return True
+
+
+def _minify_pair(pair):
+    # Top-level so it can be pickled for Pool workers
+    return minify_file(*pair)
 
 
 def main():
     p = argparse.ArgumentParser(description="Minify JS with rjsmin")
     p.add_argument("inputs", nargs="+", help="JS files or directories")
     p.add_argument("-o", "--out", default="dist", help="Output dir for minified files")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                   help="Parallel worker processes (default: CPU count)")
     args = p.parse_args()
 
     out_root = pathlib.Path(args.out)
+    jobs = []
     for inp in args.inputs:
         pth = pathlib.Path(inp)
         if pth.is_dir():
             for src in pth.rglob("*.js"):
                 rel = src.relative_to(pth)
-                dst = out_root / rel.with_suffix(".min.js")
-                minify_file(src, dst)
+                jobs.append((src, out_root / rel.with_suffix(".min.js")))
         else:
             src = pth
-            dst = out_root / src.name.replace(".js", ".min.js")
-            minify_file(src, dst)
+            jobs.append((src, out_root / src.name.replace(".js", ".min.js")))
+
+    # Files are independent, so spread the CPU-bound jsmin work over worker processes
+    if args.jobs > 1 and len(jobs) > 1:
+        with multiprocessing.Pool(min(args.jobs, len(jobs))) as pool:
+            results = list(pool.imap_unordered(_minify_pair, jobs, chunksize=4))
+    else:
+        results = [_minify_pair(pair) for pair in jobs]
+    processed = sum(results)
+    print(f"Minified {processed} file(s), skipped {len(results) - processed} up-to-date")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
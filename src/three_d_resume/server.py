@@ -1,14 +1,37 @@
 #!/usr/bin/env python3
 import argparse
 import contextlib
+import functools
+import gzip
+import hashlib
+import html as html_lib
+import io
+import json
+import mimetypes
 import os
+import re
 import socket
 import sys
 import threading
 import time
+import urllib.request
 import webbrowser
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional: without it responses fall back to gzip
+    brotli = None
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: faster resume.json parsing
+    orjson = None
+
+_loads_json = orjson.loads if orjson is not None else json.loads
 
 # A dev-friendly static server that:
 # - Serves ESM JS correctly (application/javascript)
@@ -19,6 +42,263 @@ from typing import Optional
 
 PAGES_DIR = "page"
 TEMPLATE_FILE = "assets/html/template.html"  # SPA template; assets live under ./assets
+# Bump when the generated markup changes so pages rendered by older code are rebuilt
+_GENERATOR_VERSION = "v2"
+
+# Patterns used by the page generator, compiled once per process
+_ASSET_PREFIX_RE = re.compile(r'\b(href|src)="\./assets/')
+_URL_SCHEME_RE = re.compile(r"^https?://")
+
+# Themes styled in assets/css/styles.css; other names are reduced to token characters
+_KNOWN_THEMES = frozenset({"classic", "elegant"})
+_THEME_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_-")
+
+
+class _Span(NamedTuple):
+    tag: str
+    open_start: int   # offset of "<tag"
+    open_end: int     # offset just past the opening tag's ">"
+    close_start: int  # offset of "</tag"
+    close_end: int    # offset just past the closing tag's ">"
+
+
+class _TemplateIndex(HTMLParser):
+    """One tokenizer pass over an HTML document recording where each element with an id lives.
+
+    ``spans`` maps id -> _Span of character offsets into the source, so edits can be
+    spliced in without re-scanning the document per element. ``landmarks`` holds the
+    first <head>, <title> and <body>; for body only the opening tag is recorded
+    (its close offsets equal open_end).
+    """
+
+    _VOID = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input",
+                       "link", "meta", "source", "track", "wbr"})
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=False)
+        self.source = source
+        self.spans: Dict[str, _Span] = {}
+        self.landmarks: Dict[str, _Span] = {}
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self._open: List[Tuple[str, Optional[str], int, int]] = []
+        self.feed(source)
+        self.close()
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_starts[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        end = start + len(self.get_starttag_text() or "")
+        elem_id = dict(attrs).get("id")
+        if tag == "body":
+            self.landmarks.setdefault(tag, _Span(tag, start, end, end, end))
+        if tag in self._VOID:
+            if elem_id:
+                self.spans.setdefault(elem_id, _Span(tag, start, end, end, end))
+            return
+        self._open.append((tag, elem_id, start, end))
+
+    def handle_startendtag(self, tag, attrs):
+        start = self._offset()
+        end = start + len(self.get_starttag_text() or "")
+        elem_id = dict(attrs).get("id")
+        if elem_id:
+            self.spans.setdefault(elem_id, _Span(tag, start, end, end, end))
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _, _, _ in self._open):
+            return  # stray end tag
+        close_start = self._offset()
+        close_end = self.source.find(">", close_start) + 1
+        while self._open:
+            t, elem_id, start, end = self._open.pop()
+            if t == tag:
+                if elem_id:
+                    self.spans.setdefault(elem_id, _Span(t, start, end, close_start, close_end))
+                if t in ("head", "title"):
+                    self.landmarks.setdefault(t, _Span(t, start, end, close_start, close_end))
+                break
+
+
+# Template content digest -> (asset-normalized template, id spans, landmarks); holds the latest
+# template only
+_TEMPLATE_CACHE: Dict[bytes, Tuple[str, Dict[str, _Span], Dict[str, _Span]]] = {}
+
+
+def _load_template(template_bytes: bytes) -> Tuple[str, Dict[str, _Span], Dict[str, _Span]]:
+    """Decode, normalize and index the template, reusing the previous result for the same bytes.
+
+    Keyed on the content just read, so an edit is picked up even when it keeps the file's
+    size and mtime.
+    """
+    key = hashlib.blake2b(template_bytes, digest_size=16).digest()
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    html = template_bytes.decode("utf-8")
+    # Normalize asset paths so timestamped pages under /page can load them correctly
+    html = _ASSET_PREFIX_RE.sub(r'\1="/assets/', html)
+    index = _TemplateIndex(html)
+    entry = (html, index.spans, index.landmarks)
+    _TEMPLATE_CACHE.clear()
+    _TEMPLATE_CACHE[key] = entry
+    return entry
+
+
+def _splice_by_id(html: str, spans: Dict[str, _Span], inner: Dict[str, Sequence[str]],
+                  outer: Dict[str, str], removed: List[str],
+                  patches: List[Tuple[int, int, Sequence[str]]]) -> List[str]:
+    """Apply page edits to the indexed template html in a single left-to-right pass.
+
+    inner replaces element contents, outer whole elements and removed drops <section>
+    blocks, all by id; patches are extra (start, end, fragments) edits by offset.
+    Returns the document as a list of fragments; callers join (or write) it once.
+    """
+    patches = list(patches)
+    for elem_id, fragments in inner.items():
+        span = spans.get(elem_id)
+        if span:
+            patches.append((span.open_end, span.close_start, fragments))
+    for elem_id, replacement in outer.items():
+        span = spans.get(elem_id)
+        if span:
+            patches.append((span.open_start, span.close_end, (replacement,)))
+    for sec_id in removed:
+        span = spans.get(sec_id)
+        if span and span.tag == "section":
+            patches.append((span.open_start, span.close_end, ()))
+    patches.sort(key=lambda patch: patch[0])
+    out: List[str] = []
+    cursor = 0
+    for start, end, fragments in patches:
+        out.append(html[cursor:start])
+        out.extend(fragments)
+        cursor = end
+    out.append(html[cursor:])
+    return out
+
+# One work card per resume work item; all values are pre-escaped HTML
+_WORK_CARD_FMT = (
+    '<div class="work-card" {json_attr}{step_attr}>'
+    '<div class="work-head">'
+    '<div class="work-title">'
+    '<strong>{name} — {position}</strong>'
+    '{website_link}'
+    '<span class="muted">{dates}</span>'
+    '</div>'
+    '<div class="badges">{highlights}</div>'
+    '</div>'
+    '<div>{summary}</div>'
+    '<div class="mobile-rotate-hint" role="note" aria-live="polite">'
+    '<span class="hint-icon" aria-hidden="true">📱↻</span>'
+    '<span>Für eine bessere Ansicht bitte das Smartphone drehen (Querformat) oder einen '
+    'Desktop‑Browser verwenden.</span>'
+    '</div>'
+    '<div class="viewer-wrap">'
+    '<div class="viewer-canvas"></div>'
+    '</div>'
+    '</div>'
+)
+
+
+# html.escape (quote=True is its default) memoized: keywords, highlights and dates
+# repeat across skills and work items
+_esc = functools.lru_cache(maxsize=2048)(html_lib.escape)
+
+
+# Local avatar formats, best first
+_AVATAR_PREFS = {".avif": 0, ".webp": 1, ".jpeg": 2, ".jpg": 3, ".png": 4}
+
+
+@functools.lru_cache(maxsize=4)
+def _find_local_avatar(img_dir: str, dir_mtime_ns: int) -> Optional[str]:
+    """URL of the preferred assets/image/person.* file, or None.
+
+    Adding, removing or renaming files bumps dir_mtime_ns, which is only part of the
+    cache key so that the directory is rescanned then.
+    """
+    local_avatar = None
+    best_rank = len(_AVATAR_PREFS) + 1
+    # pick preferred by extension in a single directory pass; stop at the best format
+    with os.scandir(img_dir) as it:
+        for entry in it:
+            fn = entry.name.lower()
+            if not fn.startswith("person."):
+                continue
+            rank = _AVATAR_PREFS.get(os.path.splitext(fn)[1], len(_AVATAR_PREFS))
+            if rank < best_rank:
+                best_rank = rank
+                local_avatar = "/assets/image/" + entry.name
+                if rank == 0:
+                    break
+    return local_avatar
+
+
+def _norm_asset(url: str) -> str:
+    """Make ./relative URLs project-root relative so pages under /page can load them."""
+    return "/" + url[2:] if url.startswith("./") else url
+
+
+def _source_stamps(template_path: str = TEMPLATE_FILE,
+                   resume_path: str = "resume.json") -> List[Optional[List[int]]]:
+    """(mtime_ns, size) of the template and resume.json; None for a missing file."""
+    stamps: List[Optional[List[int]]] = []
+    for src in (template_path, resume_path):
+        try:
+            st = os.stat(src)
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append([st.st_mtime_ns, st.st_size])
+    return stamps
+
+
+def _source_key(template_bytes: bytes, resume_bytes: bytes) -> str:
+    """Content hash identifying the sources a page was rendered from."""
+    h = hashlib.sha1(template_bytes)
+    h.update(b"\0")
+    h.update(resume_bytes)
+    return h.hexdigest()[:16]
+
+
+def _read_source(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def _meta_path(page_path: str) -> str:
+    return os.path.splitext(page_path)[0] + ".meta"
+
+
+def _write_page_meta(page_path: str, key: str, stamps: List[Optional[List[int]]]) -> None:
+    """Record which sources page_path was rendered from (sidecar <page>.meta)."""
+    try:
+        with open(_meta_path(page_path), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "stamps": stamps, "version": _GENERATOR_VERSION}, f)
+    except OSError as e:
+        print(f"[BUILD] Warning: Could not write page metadata: {e}")
+
+
+def _read_page_meta(page_path: str) -> Optional[dict]:
+    try:
+        with open(_meta_path(page_path), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def _download_vendor_file(url: str, dest: str) -> None:
+    with urllib.request.urlopen(url, timeout=15) as resp:
+        data = resp.read()
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, 'wb') as outf:
+        outf.write(data)
 
 
 def timestamp_name() -> str:
@@ -26,27 +306,38 @@ def timestamp_name() -> str:
 
 
 def generate_page_from_template() -> str:
-    import json
-    import html as html_lib
-    import urllib.request
+    return generate_page_from_resume("resume.json", PAGES_DIR)
+
+
+def generate_page_from_resume(resume_path: str, pages_dir: str = PAGES_DIR, root: str = ".") -> str:
+    """Render resume_path into a new timestamped page under pages_dir and return its path.
+
+    The template and vendor assets are taken from the project directory root.
+    """
+    global _NEWEST_CACHE, _PAGE_CACHE
 
     def ensure_vendor_assets():
-        os.makedirs(os.path.join('assets','js','vendor'), exist_ok=True)
-        os.makedirs(os.path.join('assets','css','vendor'), exist_ok=True)
+        global _VENDOR_OK_DIR
+        project_dir = os.path.abspath(root)
+        if _VENDOR_OK_DIR == project_dir:
+            return
+        os.makedirs(os.path.join(root,'assets','js','vendor'), exist_ok=True)
+        os.makedirs(os.path.join(root,'assets','css','vendor'), exist_ok=True)
         # Ensure local ESM exists; download pinned version if missing
-        esm_path = os.path.join('assets','js','vendor','three-cad-viewer.esm.js')
+        esm_path = os.path.join(root,'assets','js','vendor','three-cad-viewer.esm.js')
+        esm_download = None
         if not os.path.exists(esm_path):
-            try:
-                url = 'https://unpkg.com/three-cad-viewer@3.5.1/dist/three-cad-viewer.esm.js'
-                with urllib.request.urlopen(url, timeout=15) as resp:
-                    data = resp.read()
-                with open(esm_path, 'wb') as outf:
-                    outf.write(data)
-                print('[BUILD] Downloaded vendor ESM three-cad-viewer.esm.js (3.5.1)')
-            except Exception as e:
-                print(f"[BUILD] Warning: Could not download three-cad-viewer.esm.js: {e}")
+            # Fetched on a worker thread, overlapping the CSS check/download below
+            pool = ThreadPoolExecutor(max_workers=1)
+            esm_download = pool.submit(
+                _download_vendor_file,
+                'https://unpkg.com/three-cad-viewer@3.5.1/dist/three-cad-viewer.esm.js',
+                esm_path,
+            )
+            pool.shutdown(wait=False)
         # Ensure CSS exists under assets/css/vendor; copy from old path if present, else download
-        vendor_css_path = os.path.join('assets','css','vendor','three-cad-viewer.css')
+        vendor_css_path = os.path.join(root,'assets','css','vendor','three-cad-viewer.css')
+        css_ok = False
         try:
             needs_upstream = False
             if os.path.exists(vendor_css_path):
@@ -66,61 +357,69 @@ def generate_page_from_template() -> str:
             if needs_upstream:
                 # Try to download official upstream CSS; if that fails, try to copy legacy file
                 try:
-                    url = 'https://unpkg.com/three-cad-viewer@3.5.1/dist/three-cad-viewer.css'
-                    with urllib.request.urlopen(url, timeout=15) as resp:
-                        data = resp.read()
-                    os.makedirs(os.path.dirname(vendor_css_path), exist_ok=True)
-                    with open(vendor_css_path, 'wb') as outf:
-                        outf.write(data)
+                    _download_vendor_file(
+                        'https://unpkg.com/three-cad-viewer@3.5.1/dist/three-cad-viewer.css',
+                        vendor_css_path,
+                    )
+                    css_ok = True
                     print('[BUILD] Ensured upstream vendor CSS three-cad-viewer.css (3.5.1)')
                 except Exception as e_dl:
                     # Fallback: copy from legacy path if available
-                    legacy_css_path = os.path.join('assets','css','three-cad-viewer.css')
+                    legacy_css_path = os.path.join(root,'assets','css','three-cad-viewer.css')
                     if os.path.exists(legacy_css_path):
                         with open(legacy_css_path, 'rb') as src, open(vendor_css_path, 'wb') as dst:
                             dst.write(src.read())
                         print('[BUILD] Copied legacy CSS to assets/css/vendor/three-cad-viewer.css (download failed)')
                     else:
                         print(f"[BUILD] Warning: Could not ensure vendor CSS: {e_dl}")
+            else:
+                css_ok = True
         except Exception as e:
             print(f"[BUILD] Warning: Could not ensure vendor CSS: {e}")
+        if esm_download is not None:
+            try:
+                esm_download.result()
+                print('[BUILD] Downloaded vendor ESM three-cad-viewer.esm.js (3.5.1)')
+            except Exception as e:
+                print(f"[BUILD] Warning: Could not download three-cad-viewer.esm.js: {e}")
+        # Everything in place: later builds in this process skip the checks.
+        # After a failed download they keep retrying, as before.
+        if css_ok and os.path.exists(esm_path):
+            _VENDOR_OK_DIR = project_dir
 
-    def esc(s: str) -> str:
-        return html_lib.escape(s, quote=True)
-
-    def set_inner(h: str, elem_id: str, new_html: str) -> str:
-        # Replace innerHTML of the element with given id using a simple regex
-        import re
-        pattern = re.compile(rf'(<'
-                             rf'[^>]*id="{re.escape(elem_id)}"[^>]*>)'
-                             rf'(.*?)'
-                             rf'(</[^>]+>)', re.S)
-        def repl(m):
-            return m.group(1) + new_html + m.group(3)
-        return pattern.sub(repl, h, count=1)
-
-    def remove_section(h: str, sec_id: str) -> str:
-        """Remove the entire <section id="sec_id" ...> ... </section> block if present."""
-        import re
-        # non-greedy to match the nearest closing </section>
-        pattern = re.compile(rf'<section[^>]*id="{re.escape(sec_id)}"[^>]*>.*?</section>', re.S | re.I)
-        return pattern.sub('', h, count=1)
-
-    os.makedirs(PAGES_DIR, exist_ok=True)
-    if not os.path.exists(TEMPLATE_FILE):
-        raise FileNotFoundError(f"Template {TEMPLATE_FILE} not found")
-    with open(TEMPLATE_FILE, "r", encoding="utf-8") as f:
-        html = f.read()
-    # Normalize asset paths so timestamped pages under /page can load them correctly
-    html = html.replace('href="./assets/', 'href="/assets/').replace('src="./assets/', 'src="/assets/')
+    # A local name keeps the many per-item calls on the fast LOAD_FAST path
+    esc = _esc
+
+    # Element edits are collected while rendering and spliced into the template in one pass
+    inner_html: Dict[str, Sequence[str]] = {}
+    outer_html: Dict[str, str] = {}
+    removed_sections: List[str] = []
+
+    def set_inner(elem_id: str, *fragments: str) -> None:
+        inner_html[elem_id] = fragments
+
+    def remove_section(sec_id: str) -> None:
+        """Drop the entire <section id="sec_id" ...> ... </section> block if present."""
+        removed_sections.append(sec_id)
 
-    # Load resume.json and keep raw string for inline script (tests rely on it)
-    resume_json_str = None
+    os.makedirs(pages_dir, exist_ok=True)
+    template_path = os.path.join(root, TEMPLATE_FILE)
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template {template_path} not found")
+    stamps = _source_stamps(template_path, resume_path)
+    with open(template_path, "rb") as f:
+        template_bytes = f.read()
+    html, spans, landmarks = _load_template(template_bytes)
+    # Offset edits to the template outside id'd elements: title, head tags, body theme
+    patches: List[Tuple[int, int, Sequence[str]]] = []
+
+    # Load resume.json; the raw bytes also feed the page cache key
+    resume_bytes = b""
     resume = {}
     try:
-        with open("resume.json", "r", encoding="utf-8") as rf:
-            resume_json_str = rf.read()
-            resume = json.loads(resume_json_str)
+        with open(resume_path, "rb") as rf:
+            resume_bytes = rf.read()
+        resume = _loads_json(resume_bytes)
     except Exception as e:
         print(f"[BUILD] Warning: Could not read or parse resume.json: {e}")
 
@@ -133,10 +432,24 @@ def generate_page_from_template() -> str:
         # Title
         name = basics.get("name") or ""
         label = basics.get("label") or ""
-        title_text = (name + (" — " + label if label else "")) or "Lebenslauf"
+        title_text = (f"{name} — {label}" if label else name) or "Lebenslauf"
         # Replace <title> ... </title>
-        import re
-        html = re.sub(r"<title>.*?</title>", f"<title>{esc(title_text)}</title>", html, flags=re.S)
+        title_e = esc(title_text)
+        title_span = landmarks.get("title")
+        if title_span:
+            patches.append(
+                (title_span.open_start, title_span.close_end, (f"<title>{title_e}</title>",))
+            )
+
+        # avatar src: prefer local /assets/image/person.* if present, prioritizing AVIF/WEBP over
+        # JPEG/PNG; fallback to basics.image
+        try:
+            img_dir = os.path.abspath(os.path.join(root, "assets", "image"))
+            local_avatar = _find_local_avatar(img_dir, os.stat(img_dir).st_mtime_ns)
+        except Exception:
+            local_avatar = None
+        avatar_src = local_avatar or basics.get("image") or ""
+        avatar_e = esc(avatar_src)
 
         # --- SEO meta: description, canonical, OpenGraph/Twitter, theme-color, JSON-LD ---
         # Derive summary for description (truncate around 160 chars)
@@ -150,10 +463,6 @@ def generate_page_from_template() -> str:
         # Canonical: prefer provided website if present, else point to local index
         website = str(basics.get("website", "") or "").strip()
         canonical_href = website if website else "/index.html"
-        # Avatar/image
-        # avatar_src will be computed shortly below (local override). For SEO block, we temporarily use basics.image;
-        # we'll replace it with the final avatar_src after it's known.
-        og_image = (basics.get("image") or "")
         # Build social profile URLs for sameAs
         profiles = basics.get("profiles", []) or []
         same_as = [p.get("url") for p in profiles if isinstance(p, dict) and p.get("url")]
@@ -167,284 +476,412 @@ def generate_page_from_template() -> str:
             '<meta name="theme-color" media="(prefers-color-scheme: light)" content="#ffffff" />\n'
             '<meta name="theme-color" media="(prefers-color-scheme: dark)" content="#0f1115" />'
         )
-        # Open Graph and Twitter metas (image filled later if local avatar is found)
+        # JSON-LD Person schema; optional fields are only added when set
+        person_ld = {
+            "@context": "https://schema.org",
+            "@type": "Person",
+            "name": name,
+            "jobTitle": label,
+        }
+        if raw_summary:
+            person_ld["description"] = raw_summary
+        if email:
+            person_ld["email"] = f"mailto:{email}"
+        person_ld["image"] = avatar_src
+        if website:
+            person_ld["url"] = website
+        address = {"@type": "PostalAddress"}
+        if city:
+            address["addressLocality"] = city
+        if country:
+            address["addressCountry"] = country
+        person_ld["address"] = address
+        if same_as:
+            person_ld["sameAs"] = same_as
+        ld_json = json.dumps(person_ld, ensure_ascii=False)
+        # Open Graph and Twitter metas (image tags only with an avatar), JSON-LD and
+        # the hero image preload all go right before </head>
+        desc_e = esc(desc)
         seo_head = (
-            f'\n  <meta name="description" content="{esc(desc)}" />\n'
+            f'\n  <meta name="description" content="{desc_e}" />\n'
             f'  <link rel="canonical" href="{esc(canonical_href)}" />\n'
-            f'  <meta property="og:title" content="{esc(title_text)}" />\n'
-            f'  <meta property="og:description" content="{esc(desc)}" />\n'
+            f'  <meta property="og:title" content="{title_e}" />\n'
+            f'  <meta property="og:description" content="{desc_e}" />\n'
             f'  <meta property="og:type" content="profile" />\n'
             f'  <meta property="og:locale" content="de_DE" />\n'
             f'  <meta name="twitter:card" content="summary_large_image" />\n'
-            f'  <meta name="twitter:title" content="{esc(title_text)}" />\n'
-            f'  <meta name="twitter:description" content="{esc(desc)}" />\n'
+            f'  <meta name="twitter:title" content="{title_e}" />\n'
+            f'  <meta name="twitter:description" content="{desc_e}" />\n'
             f'  {theme_color_block}\n'
         )
-        # Insert placeholder for og:image/twitter:image to be patched later once avatar_src is computed
-        seo_head += '  <!--__SEO_IMAGE_PLACEHOLDER__-->'
-        # JSON-LD Person schema (image patched later)
-        import json as _json
-        person_ld = {
-            "@context": "https://schema.org",
-            "@type": "Person",
-            "name": name,
-            "jobTitle": label,
-            "description": raw_summary or None,
-            "email": f"mailto:{email}" if email else None,
-            "image": "__SEO_IMAGE_JSONLD__",
-            "url": website or None,
-            "address": {
-                "@type": "PostalAddress",
-                "addressLocality": city or None,
-                "addressCountry": country or None,
-            },
-            "sameAs": same_as or None,
-        }
-        # Remove None values cleanly
-        def _drop_none(obj):
-            if isinstance(obj, dict):
-                return {k: _drop_none(v) for k, v in obj.items() if v is not None}
-            if isinstance(obj, list):
-                return [
-                    _drop_none(v) for v in obj if v is not None
-                ]
-            return obj
-        person_ld = _drop_none(person_ld)
-        ld_json = _json.dumps(person_ld, ensure_ascii=False)
-        seo_head += f"\n  <script type=\"application/ld+json\">{ld_json}</script>\n"
-        # Inject all SEO tags before closing head for now (image URLs will be corrected below)
-        html = re.sub(r"</head>", seo_head + "\n</head>", html, count=1)
+        if avatar_src:
+            seo_head += (
+                f'  <meta property="og:image" content="{avatar_e}" />\n'
+                f'  <meta name="twitter:image" content="{avatar_e}" />\n'
+            )
+        seo_head += f"\n  <script type=\"application/ld+json\">{ld_json}</script>\n\n"
+        if avatar_src:
+            # Preload hero image to improve LCP
+            seo_head += f"  <link rel=\"preload\" as=\"image\" href=\"{avatar_e}\" />\n"
+        head_span = landmarks.get("head")
+        if head_span:
+            patches.append((head_span.close_start, head_span.close_start, (seo_head,)))
 
         # Theme: add data-theme attribute to <body> based on resume.meta.theme (default: classic)
         meta = resume.get("meta", {}) if isinstance(resume.get("meta", {}), dict) else {}
         theme = str(meta.get("theme", "classic")).strip().lower() or "classic"
         # sanitize: allow only simple token characters
-        import re as _re
-        theme = _re.sub(r"[^a-z0-9_-]", "", theme)
-        # Inject data-theme into the first <body> tag
-        def _body_attr_inject(m):
-            tag_open = m.group(0)
-            if "data-theme=" in tag_open:
-                return tag_open
-            # insert before closing '>' while preserving any existing attributes
-            if tag_open.endswith('>'):
-                return tag_open[:-1] + f' data-theme="{esc(theme)}">'
-            return tag_open
-        html = _re.sub(r"<body(?![^>]*data-theme)[^>]*>", _body_attr_inject, html, count=1)
+        if theme not in _KNOWN_THEMES:
+            theme = "".join(c for c in theme if c in _THEME_CHARS)
+        # Inject data-theme into the first <body> tag, before its closing '>', unless the
+        # template sets one
+        body_span = landmarks.get("body")
+        if body_span and "data-theme" not in html[body_span.open_start:body_span.open_end]:
+            theme_attr = f' data-theme="{esc(theme)}"'
+            patches.append((body_span.open_end - 1, body_span.open_end - 1, (theme_attr,)))
 
         # Basics fields
-        # avatar src: prefer local /assets/image/person.* if present, prioritizing AVIF/WEBP over JPEG/PNG; fallback to basics.image
-        local_avatar = None
-        try:
-            img_dir = os.path.join("assets", "image")
-            if os.path.isdir(img_dir):
-                # pick preferred by extension
-                prefs = ['.avif', '.webp', '.jpeg', '.jpg', '.png']
-                candidates = [fn for fn in os.listdir(img_dir) if fn.lower().startswith('person.')]
-                def _score(fn):
-                    import os as _os
-                    return prefs.index(_os.path.splitext(fn.lower())[1]) if _os.path.splitext(fn.lower())[1] in prefs else 999
-                if candidates:
-                    candidates.sort(key=_score)
-                    local_avatar = "/assets/image/" + candidates[0]
-        except Exception:
-            local_avatar = None
-        avatar_src = local_avatar or basics.get("image") or ""
         if avatar_src:
-            # Preload hero image to improve LCP
-            html = re.sub(r"</head>", f"  <link rel=\"preload\" as=\"image\" href=\"{esc(avatar_src)}\" />\n</head>", html, count=1)
             # Add attributes to avatar image for better performance/CLS
-            html = re.sub(
-                r'<img id="avatar"([^>]*)>',
-                f'<img id="avatar"\\1 src="{esc(avatar_src)}" width="120" height="120" decoding="async" fetchpriority="high" loading="eager">',
-                html
-            )
-            # Patch SEO image placeholders now that avatar_src is known
-            og_img_block = (
-                f'  <meta property="og:image" content="{esc(avatar_src)}" />\n'
-                f'  <meta name="twitter:image" content="{esc(avatar_src)}" />\n'
-            )
-            html = html.replace('  <!--__SEO_IMAGE_PLACEHOLDER__-->', og_img_block)
-            html = html.replace('__SEO_IMAGE_JSONLD__', avatar_src)
-        else:
-            # Remove placeholder if no image available
-            html = html.replace('  <!--__SEO_IMAGE_PLACEHOLDER__-->', '')
-            html = html.replace('__SEO_IMAGE_JSONLD__', '')
+            # (inserted just before the tag's closing '>', keeping the template's attributes)
+            avatar_span = spans.get("avatar")
+            if avatar_span:
+                patches.append((avatar_span.open_end - 1, avatar_span.open_end - 1, (
+                    f' src="{avatar_e}" width="120" height="120" decoding="async"'
+                    ' fetchpriority="high" loading="eager"',
+                )))
         # name/label/summary
-        html = set_inner(html, "name", esc(name))
-        html = set_inner(html, "label", esc(label))
-        html = set_inner(html, "summary", esc(basics.get("summary", "")))
+        set_inner("name", esc(name))
+        set_inner("label", esc(label))
+        set_inner("summary", esc(basics.get("summary") or ""))
         # email
         email = basics.get("email") or ""
         # Replace entire email anchor to avoid duplicate href attributes
-        html = re.sub(r'<a id="email"[^>]*>.*?</a>', f'<a id="email" href="mailto:{esc(email)}">{esc(email or "E-Mail")}</a>', html, flags=re.S)
+        outer_html["email"] = (
+            f'<a id="email" href="mailto:{esc(email)}">{esc(email or "E-Mail")}</a>'
+        )
         # location
         loc_text = ", ".join([x for x in [basics.get("location", {}).get("city"), basics.get("location", {}).get("countryCode")] if x])
-        html = set_inner(html, "location", esc(loc_text))
+        set_inner("location", esc(loc_text))
         # profiles
         profiles = basics.get("profiles", [])
-        prof_html = "".join([
-            f'<a href="{esc(p.get("url","#"))}" target="_blank" rel="noopener">{esc((p.get("network")+": ") if p.get("network") else "") + esc(p.get("username") or p.get("url") or "")}</a>'
-        for p in profiles])
-        html = set_inner(html, "profiles", prof_html)
+        profile_links: List[str] = []
+        for p in profiles:
+            network = p.get("network")
+            url_e = esc(p.get("url", "#"))
+            network_e = f"{esc(network)}: " if network else ""
+            handle_e = esc(p.get("username") or p.get("url") or "")
+            profile_links.append(
+                f'<a href="{url_e}" target="_blank" rel="noopener">{network_e}{handle_e}</a>'
+            )
+        set_inner("profiles", *profile_links)
 
         # Skills
         skills = resume.get("skills", [])
-        skills_html = "".join([
-            '<div class="card">'
-            f'<strong>{esc(s.get("name",""))} • {esc(s.get("level",""))}</strong>'
-            '<div class="badges" style="margin-top:8px">'
-            + "".join([f'<span class="badge">{esc(k)}</span>' for k in (s.get("keywords") or [])]) +
-            '</div>'
-            '</div>'
-            for s in skills
-        ])
-        if skills and skills_html:
-            html = set_inner(html, "skillsList", skills_html)
+        skill_cards: List[str] = []
+        append = skill_cards.append
+        for s in skills:
+            name_e = esc(s.get("name") or "")
+            level_e = esc(s.get("level") or "")
+            append(f'<div class="card"><strong>{name_e} • {level_e}</strong>'
+                   '<div class="badges" style="margin-top:8px">')
+            for k in s.get("keywords") or ():
+                append(f'<span class="badge">{esc(k)}</span>')
+            append('</div></div>')
+        if skill_cards:
+            set_inner("skillsList", *skill_cards)
         else:
-            html = remove_section(html, "skills")
+            remove_section("skills")
 
         # Work (with viewer containers)
-        def fmt_date(d):
-            return d or ""
         work = resume.get("work", [])
-        work_items = []
-        for idx, w in enumerate(work):
-            step_url = w.get("stepUrl", "")
-            json_url = w.get("jsonUrl", "")
-            # Normalize relative URLs to be project-root relative so that pages under /page can load assets
-            if isinstance(step_url, str) and step_url.startswith("./"):
-                step_url = "/" + step_url[2:]
-            if isinstance(json_url, str) and json_url.startswith("./"):
-                json_url = "/" + json_url[2:]
-            dates = f"{fmt_date(w.get('startDate',''))}{' — ' + fmt_date(w.get('endDate')) if w.get('endDate') else ''}"
-            highlights = "".join([f'<span class="badge">{esc(h)}</span>' for h in (w.get("highlights") or [])[:5]])
+        work_items: List[str] = []
+        for w in work:
+            step_url = _norm_asset(w.get("stepUrl") or "")
+            json_url = _norm_asset(w.get("jsonUrl") or "")
+            start_date = w.get("startDate") or ""
+            end_date = w.get("endDate")
             website = w.get("website") or ""
-            website_link = f'<a href="{esc(website)}" target="_blank" rel="noopener">{esc(re.sub(r"^https?://", "", website))}</a>' if website else ''
-            file_id = f"file-{idx}"
-            work_items.append(
-                '<div class="work-card" '
-                + (f'data-json-url="{esc(json_url)}" ' if json_url else '')
-                + (f'data-step-url="{esc(step_url)}" ' if step_url else '')
-                + '>'
-                '<div class="work-head">'
-                '<div class="work-title">'
-                f'<strong>{esc(w.get("name",""))} — {esc(w.get("position") or "")}</strong>'
-                f'{website_link}'
-                f'<span class="muted">{esc(dates)}</span>'
-                '</div>'
-                f'<div class="badges">{highlights}</div>'
-                '</div>'
-                f'<div>{esc(w.get("summary",""))}</div>'
-                '<div class="mobile-rotate-hint" role="note" aria-live="polite">'
-                '<span class="hint-icon" aria-hidden="true">📱↻</span>'
-                '<span>Für eine bessere Ansicht bitte das Smartphone drehen (Querformat) oder einen Desktop‑Browser verwenden.</span>'
-                '</div>'
-                '<div class="viewer-wrap">'
-                '<div class="viewer-canvas"></div>'
-                '</div>'
-                '</div>'
-            )
+            work_items.append(_WORK_CARD_FMT.format(
+                json_attr=f'data-json-url="{esc(json_url)}" ' if json_url else '',
+                step_attr=f'data-step-url="{esc(step_url)}" ' if step_url else '',
+                name=esc(w.get("name") or ""),
+                position=esc(w.get("position") or ""),
+                website_link=(
+                    f'<a href="{esc(website)}" target="_blank" rel="noopener">'
+                    f'{esc(_URL_SCHEME_RE.sub("", website))}</a>'
+                ) if website else '',
+                dates=esc(f"{start_date} — {end_date}" if end_date else start_date),
+                highlights="".join(
+                    [f'<span class="badge">{esc(h)}</span>' for h in (w.get("highlights") or [])[:5]]
+                ),
+                summary=esc(w.get("summary") or ""),
+            ))
         if work_items:
-            html = set_inner(html, "workList", "".join(work_items))
+            set_inner("workList", *work_items)
         else:
-            html = remove_section(html, "work")
+            remove_section("work")
 
         # Education
         edu = resume.get("education", [])
-        edu_html = "".join([
-            '<div class="card">'
-            f'<strong>{esc(e.get("institution",""))}</strong>'
-            f'<div class="muted">{esc((e.get("studyType") or "") + (" — " + e.get("area") if e.get("area") else ""))}</div>'
-            f'<div class="muted">{esc(((e.get("startDate") or "") + (" — " + e.get("endDate") if e.get("endDate") else "")))}</div>'
-            '</div>'
-            for e in edu
-        ])
-        if edu and edu_html:
-            html = set_inner(html, "educationList", edu_html)
+        edu_cards: List[str] = []
+        for e in edu:
+            area = e.get("area")
+            study_type = e.get("studyType") or ""
+            start_date = e.get("startDate") or ""
+            end_date = e.get("endDate")
+            institution_e = esc(e.get("institution") or "")
+            study_e = esc(f"{study_type} — {area}" if area else study_type)
+            dates_e = esc(f"{start_date} — {end_date}" if end_date else start_date)
+            edu_cards.append(
+                f'<div class="card"><strong>{institution_e}</strong>'
+                f'<div class="muted">{study_e}</div>'
+                f'<div class="muted">{dates_e}</div></div>'
+            )
+        if edu_cards:
+            set_inner("educationList", *edu_cards)
         else:
-            html = remove_section(html, "education")
+            remove_section("education")
 
         # Awards
         awards = resume.get("awards", [])
-        awards_html = "".join([f'<li><strong>{esc(a.get("title",""))}</strong>{(" — " + esc(a.get("awarder",""))) if a.get("awarder") else ""}</li>' for a in awards])
-        if awards and awards_html:
-            html = set_inner(html, "awardsList", awards_html)
+        award_items: List[str] = []
+        for a in awards:
+            awarder = a.get("awarder")
+            awarder_e = f" — {esc(awarder)}" if awarder else ""
+            award_items.append(f'<li><strong>{esc(a.get("title") or "")}</strong>{awarder_e}</li>')
+        if award_items:
+            set_inner("awardsList", *award_items)
         else:
-            html = remove_section(html, "awards")
+            remove_section("awards")
 
         # References
         refs = resume.get("references", [])
-        refs_html = "".join([
-            '<blockquote class="ref">'
-            f'<div>{esc(r.get("reference",""))}</div>'
-            f'<div class="muted" style="margin-top:8px">— {esc(r.get("name",""))}</div>'
-            '</blockquote>'
-            for r in refs
-        ])
-        if refs and refs_html:
-            html = set_inner(html, "referencesList", refs_html)
+        ref_quotes: List[str] = []
+        for r in refs:
+            reference_e = esc(r.get("reference") or "")
+            name_e = esc(r.get("name") or "")
+            ref_quotes.append(
+                f'<blockquote class="ref"><div>{reference_e}</div>'
+                f'<div class="muted" style="margin-top:8px">— {name_e}</div></blockquote>'
+            )
+        if ref_quotes:
+            set_inner("referencesList", *ref_quotes)
         else:
-            html = remove_section(html, "references")
+            remove_section("references")
 
         # Interests
         interests = resume.get("interests", [])
-        interests_html = "".join([f'<li>{esc(i.get("name",""))}</li>' for i in interests])
-        if interests and interests_html:
-            html = set_inner(html, "interestsList", interests_html)
+        interest_items = [f'<li>{esc(i.get("name") or "")}</li>' for i in interests]
+        if interest_items:
+            set_inner("interestsList", *interest_items)
         else:
-            html = remove_section(html, "interests")
+            remove_section("interests")
 
+        parts = _splice_by_id(html, spans, inner_html, outer_html, removed_sections, patches)
+    else:
+        parts = [html]
 
     out_name = timestamp_name()
-    out_path = os.path.join(PAGES_DIR, out_name)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    out_path = os.path.join(pages_dir, out_name)
+    # Encode once: the same bytes are written to disk and kept for the index route.
+    # Write to a temp name and publish with an atomic rename so concurrent readers
+    # (find_newest_page / the index route) never see a partially written page.
+    page_bytes = "".join(parts).encode("utf-8")
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(page_bytes)
+    _write_page_meta(out_path, _source_key(template_bytes, resume_bytes), stamps)
+    os.replace(tmp_path, out_path)
+    # Force the next find_newest_page() to rescan, even on coarse directory mtimes
+    _NEWEST_CACHE = (0, None)
+    st = os.stat(out_path)
+    _PAGE_CACHE = (stamps, os.path.abspath(out_path), (st.st_mtime_ns, st.st_size), page_bytes)
     print(f"[BUILD] Generated page: {out_path}")
     return out_path
 
 
-def find_newest_page() -> Optional[str]:
-    if not os.path.isdir(PAGES_DIR):
+# Project directory whose vendor ESM/CSS are known to be present; later builds there skip the checks
+_VENDOR_OK_DIR: Optional[str] = None
+
+# (PAGES_DIR st_mtime_ns, newest page) from the last directory scan
+_NEWEST_CACHE: Tuple[int, Optional[str]] = (0, None)
+
+# (source stamps, absolute path, page (mtime_ns, size), content) of the last page
+# generated by this process
+_PAGE_CACHE: Tuple[Optional[List[Optional[List[int]]]], Optional[str],
+                   Optional[Tuple[int, int]], bytes] = (None, None, None, b"")
+
+
+def _clear_caches() -> None:
+    """Forget what page builds cached in this process (templates, pages, avatar lookups)."""
+    global _VENDOR_OK_DIR, _NEWEST_CACHE, _PAGE_CACHE
+    _TEMPLATE_CACHE.clear()
+    _find_local_avatar.cache_clear()
+    _VENDOR_OK_DIR = None
+    _NEWEST_CACHE = (0, None)
+    _PAGE_CACHE = (None, None, None, b"")
+
+
+def get_cached_page_bytes(page_path: str) -> Optional[bytes]:
+    """Content of page_path if this process generated it, so it can be served without disk I/O.
+
+    The file on disk must still be the one that was written, so a page rendered from another
+    working directory, or replaced since, is never served from memory.
+    """
+    _, cached_path, page_stamp, data = _PAGE_CACHE
+    if cached_path is None or cached_path != os.path.abspath(page_path):
         return None
-    candidates = [
-        os.path.join(PAGES_DIR, fn)
-        for fn in os.listdir(PAGES_DIR)
-        if fn.lower().endswith(".html") and os.path.isfile(os.path.join(PAGES_DIR, fn))
-    ]
-    if not candidates:
+    try:
+        st = os.stat(cached_path)
+    except OSError:
         return None
-    candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-    return candidates[0]
+    return data if (st.st_mtime_ns, st.st_size) == page_stamp else None
+
+
+def find_newest_page() -> Optional[str]:
+    global _NEWEST_CACHE
+    try:
+        dir_mtime = os.stat(PAGES_DIR).st_mtime_ns
+    except OSError:
+        return None
+    # Adding, removing or renaming pages bumps the directory mtime; reuse the last scan otherwise
+    cached_mtime, cached_newest = _NEWEST_CACHE
+    if cached_mtime == dir_mtime:
+        return cached_newest
+    # Single O(n) pass; ties on mtime go to the later (timestamped) name, as before
+    with os.scandir(PAGES_DIR) as it:
+        newest_entry = max(
+            (
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.name.lower().endswith(".html") and entry.is_file()
+            ),
+            default=None,
+        )
+    newest = newest_entry[1] if newest_entry else None
+    _NEWEST_CACHE = (dir_mtime, newest)
+    return newest
+
+
+# Serializes page builds: the background build and the index route (after its wait times
+# out) would otherwise render the same page/<timestamp>.html.tmp at once
+_BUILD_LOCK = threading.Lock()
 
 
 def ensure_page_exists(force: bool = False) -> str:
-    os.makedirs(PAGES_DIR, exist_ok=True)
-    if force:
-        return generate_page_from_template()
-    newest = find_newest_page()
-    if newest:
-        # Regenerate if the source files are newer than the newest generated page
-        try:
-            newest_mtime = os.path.getmtime(newest)
-            src_candidates = [TEMPLATE_FILE, "resume.json"]
-            for src in src_candidates:
-                if os.path.exists(src) and os.path.getmtime(src) > newest_mtime:
-                    return generate_page_from_template()
-        except Exception as e:
-            print(f"[BUILD] Warning: Could not compare mtimes, regenerating. Reason: {e}")
+    with _BUILD_LOCK:
+        os.makedirs(PAGES_DIR, exist_ok=True)
+        if force:
             return generate_page_from_template()
-        # Regenerate only if the newest page appears to have broken relative asset paths
-        try:
-            with open(newest, "r", encoding="utf-8") as f:
-                content = f.read()
-            if ('href="./assets/' in content) or ('src="./assets/' in content):
+        newest = find_newest_page()
+        if newest:
+            stamps = _source_stamps()
+            # Page generated by this process from unchanged sources: no metadata to read
+            cached_stamps, cached_path, _, _ = _PAGE_CACHE
+            if cached_path == os.path.abspath(newest) and cached_stamps == stamps:
+                return newest
+            # Reuse the newest page if it was rendered from the current template + resume.json.
+            # Matching (mtime, size) stamps skip hashing; otherwise compare content hashes.
+            # Pages rendered by a different generator version are rebuilt as well.
+            meta = _read_page_meta(newest)
+            if meta is None or meta.get("version") != _GENERATOR_VERSION:
                 return generate_page_from_template()
-        except Exception as e:
-            print(f"[BUILD] Warning: Could not verify newest page, regenerating. Reason: {e}")
-            return generate_page_from_template()
-        return newest
-    return generate_page_from_template()
+            if meta.get("stamps") != stamps:
+                key = _source_key(_read_source(TEMPLATE_FILE), _read_source("resume.json"))
+                if meta.get("key") != key:
+                    return generate_page_from_template()
+                # Sources were touched but not changed; refresh stamps for the fast path
+                _write_page_meta(newest, key, stamps)
+            return newest
+        return generate_page_from_template()
+
+
+# Below this size brotli costs more time than it saves on the wire; gzip is used instead
+_BROTLI_MIN_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _accepted_encodings(accept: str) -> Tuple[str, ...]:
+    """Supported codings an Accept-Encoding value allows, best first.
+
+    Codings rank by q-value, with br ahead of gzip on ties; q=0 excludes a coding and
+    '*' covers codings not listed by name.
+    """
+    prefs: Dict[str, float] = {}
+    for token in accept.split(','):
+        name, _, params = token.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        prefs[name] = q
+    wildcard = prefs.get('*', 0.0)
+    supported = ('br', 'gzip') if brotli is not None else ('gzip',)
+    ranked = sorted(supported, key=lambda c: -prefs.get(c, wildcard))  # stable: br wins ties
+    return tuple(c for c in ranked if prefs.get(c, wildcard) > 0)
+
+
+def _pick_encoding(accept: str, size: int) -> str:
+    """The content coding for a size-byte body and an Accept-Encoding value; '' for identity."""
+    for coding in _accepted_encodings(accept):
+        if coding == 'br' and size < _BROTLI_MIN_SIZE:
+            continue
+        return coding
+    return ''
+
+
+_COMPRESSIBLE = frozenset({'.html', '.htm', '.css', '.js', '.mjs', '.json', '.svg'})
+
+
+@functools.lru_cache(maxsize=None)
+def _content_type(ext: str) -> str:
+    """Content-Type for a lowercased file extension such as '.js'."""
+    return mimetypes.guess_type('f' + ext)[0] or 'application/octet-stream'
+
+
+def _compress(raw: bytes, encoding: str) -> Tuple[Optional[str], bytes]:
+    """Encode raw with encoding ('br', 'gzip' or '' for none); (None, raw) if that fails."""
+    try:
+        if encoding == 'br':
+            return 'br', brotli.compress(raw)
+        if encoding == 'gzip':
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
+                gz.write(raw)
+            return 'gzip', buf.getvalue()
+    except Exception:
+        # fall back to uncompressed
+        pass
+    return None, raw
+
+
+# Uncompressed files up to this size are kept in memory by _file_variant; larger ones are
+# sent with sendfile. Encoded variants are cached at any size since compressing is the cost.
+_SMALL_FILE_LIMIT = 256 * 1024
+
+
+# Encoded text files above this size are compressed while streaming, in chunked transfer
+# encoding, rather than being held in memory
+_STREAM_LIMIT = 8 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _file_variant(fs_path: str, mtime_ns: int, size: int,
+                  encoding: str) -> Tuple[Optional[str], bytes]:
+    """Encoded content of a static file, compressed once per file revision.
+
+    mtime_ns and size are only part of the cache key, so edited files get a fresh entry.
+    """
+    with open(fs_path, 'rb') as f:
+        return _compress(f.read(), encoding)
 
 
 class DevHandler(SimpleHTTPRequestHandler):
@@ -460,31 +897,83 @@ class DevHandler(SimpleHTTPRequestHandler):
         "": "application/octet-stream",
     }
 
+    # Cleared while run_server builds the page in the background; the index route waits on it
+    page_ready = threading.Event()
+    page_ready.set()
+
+    # Keep-alive: every response carries Content-Length, so connections can be reused.
+    # Idle connections are dropped after timeout seconds; while open they only hold their
+    # own daemon thread, never one of PooledHTTPServer's request slots.
+    protocol_version = "HTTP/1.1"
+    timeout = 15
+
+    # PooledHTTPServer's request slot held while this request is handled, if any
+    _slot = None
+
+    def parse_request(self):
+        # Runs once the request line has arrived, before any do_* method: take a slot here so
+        # every method is bounded, while idle keep-alive connections (still waiting in
+        # readline) hold none. handle_one_request gives it back.
+        ok = super().parse_request()
+        slots = getattr(self.server, 'request_slots', None)
+        if ok and slots is not None:
+            slots.acquire()
+            self._slot = slots
+        return ok
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        finally:
+            if self._slot is not None:
+                self._slot.release()
+                self._slot = None
+
+    def setup(self):
+        super().setup()
+        try:
+            # Small responses go out immediately instead of waiting on Nagle's algorithm
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
     def _is_asset(self) -> bool:
         p = (self.path or "").split('?', 1)[0]
         return p.startswith('/assets/')
 
     def _is_compressible_path(self) -> bool:
-        import os as _os
         p = (self.path or "").split('?', 1)[0]
-        _, ext = _os.path.splitext(p)
-        return ext.lower() in {'.html', '.htm', '.css', '.js', '.mjs', '.json', '.svg', ''}
+        ext = os.path.splitext(p)[1].lower()
+        return not ext or ext in _COMPRESSIBLE
+
+    # Constant per-response headers, encoded once: (is_asset, is_compressible) -> raw header lines.
+    # Caching policy: strong caching for immutable assets; no-store for HTML/pages.
+    # Vary for compression negotiation. Basic CORS for local testing (same-origin is fine,
+    # but this helps when embedding assets).
+    _EXTRA_HEADERS = {
+        (asset, compressible): (
+            (b"Cache-Control: public, max-age=31536000, immutable\r\n" if asset else
+             b"Cache-Control: no-store, no-cache, must-revalidate, max-age=0\r\n"
+             b"Pragma: no-cache\r\n"
+             b"Expires: 0\r\n")
+            + (b"Vary: Accept-Encoding\r\n" if compressible else b"")
+            + b"Access-Control-Allow-Origin: *\r\n"
+            b"Access-Control-Allow-Methods: GET,POST,OPTIONS\r\n"
+            b"Access-Control-Allow-Headers: Content-Type\r\n"
+        )
+        for asset in (False, True)
+        for compressible in (False, True)
+    }
 
     def end_headers(self):
-        # Caching policy: strong caching for immutable assets; no-store for HTML/pages
-        if self._is_asset():
-            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
-        else:
-            self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
-            self.send_header("Pragma", "no-cache")
-            self.send_header("Expires", "0")
-        # Vary for compression negotiation
-        if self._is_compressible_path():
-            self.send_header("Vary", "Accept-Encoding")
-        # Basic CORS for local testing (same-origin is fine, but this helps when embedding assets)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        # Append the pre-encoded block straight to the pending header buffer (one list append
+        # instead of a send_header() format+encode per line)
+        if self.request_version != "HTTP/0.9":
+            if not hasattr(self, "_headers_buffer"):
+                self._headers_buffer = []
+            self._headers_buffer.append(
+                self._EXTRA_HEADERS[(self._is_asset(), self._is_compressible_path())]
+            )
         super().end_headers()
 
     def log_message(self, fmt, *args):
@@ -492,82 +981,148 @@ class DevHandler(SimpleHTTPRequestHandler):
         sys.stdout.write("[HTTP] " + (fmt % args) + "\n")
 
     def do_OPTIONS(self):
-        # CORS preflight support
-        self.send_response(204)
-        self.send_header('Content-Length', '0')
-        self.end_headers()
+        # CORS preflight support: the response is constant, so write it in one go
+        self.log_request(204)
+        if self.request_version == "HTTP/0.9":
+            return
+        self.wfile.write(
+            self.protocol_version.encode("latin-1") + b" 204 No Content\r\n"
+            b"Content-Length: 0\r\n"
+            + self._EXTRA_HEADERS[(self._is_asset(), self._is_compressible_path())]
+            + b"\r\n"
+        )
 
     def do_GET(self):
-        # Special-case favicon to avoid 404 noise in logs
-        requested = self.path.split('?', 1)[0]
-        if requested == '/favicon.ico':
-            # No favicon provided; return 204 No Content
-            self.send_response(204)
-            self.send_header('Content-Length', '0')
-            self.end_headers()
-            return
+        requested = self.path
+        if '?' in requested:
+            requested = requested.split('?', 1)[0]
 
+        # Asset and page requests (the bulk of traffic) never need rewriting
+        if not requested.startswith(('/assets/', '/page/')):
+            # Special-case favicon to avoid 404 noise in logs
+            if requested == '/favicon.ico':
+                # No favicon provided; return 204 No Content
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
 
-        # Route '/' or '/index.html' to newest page file under /page
-        if requested in ('/', '/index.html'):
-            newest = find_newest_page()
-            if newest is None:
-                # Attempt to ensure at least one page exists, then re-evaluate
-                ensure_page_exists()
+            # Route '/' or '/index.html' to newest page file under /page
+            if requested in ('/', '/index.html'):
+                self.page_ready.wait(timeout=10)
                 newest = find_newest_page()
-            if newest:
-                self.path = f"/page/{os.path.basename(newest)}"
-                requested = self.path
+                if newest is None:
+                    # Attempt to ensure at least one page exists, then re-evaluate
+                    ensure_page_exists()
+                    newest = find_newest_page()
+                if newest:
+                    self.path = f"/page/{os.path.basename(newest)}"
+                    requested = self.path
+                    # Pages generated by this process are served straight from memory when
+                    # sent as is; compressed responses take the static path below, where
+                    # _file_variant encodes each page revision once
+                    data = get_cached_page_bytes(newest)
+                    accept = self.headers.get('Accept-Encoding', '') or ''
+                    if data is not None and not _pick_encoding(accept, len(data)):
+                        self._send_body(data, 'text/html', None)
+                        return
 
-        # Try to serve compressible static files with on-the-fly compression
+        # Try to serve compressible static files with on-the-fly compression. Everything that
+        # can fail before the response starts happens here, so the default handler can
+        # still answer the request if it does.
+        body = None  # (encoding, data) from the variant cache
+        f = None     # open file, streamed compressed (coding set) or sent as is
         try:
-            import mimetypes, gzip, io, os as _os
-            accept = self.headers.get('Accept-Encoding', '') or ''
-            path_only = requested
-            # Resolve local filesystem path safely
-            fs_path = _os.path.abspath(_os.path.join(_os.getcwd(), path_only.lstrip('/')))
-            root = _os.path.abspath(_os.getcwd())
-            if fs_path.startswith(root) and _os.path.isfile(fs_path):
-                _, ext = _os.path.splitext(fs_path)
-                if ext.lower() in ('.html', '.htm', '.css', '.js', '.mjs', '.json', '.svg'):
-                    with open(fs_path, 'rb') as f:
-                        raw = f.read()
-                    # Pick encoding
-                    encoding = None
-                    data = raw
-                    try:
-                        if 'br' in accept:
-                            import brotli  # type: ignore
-                            data = brotli.compress(raw)
-                            encoding = 'br'
-                        elif 'gzip' in accept:
-                            buf = io.BytesIO()
-                            with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=6) as gz:
-                                gz.write(raw)
-                            data = buf.getvalue()
-                            encoding = 'gzip'
-                    except Exception:
-                        # fall back to uncompressed
-                        encoding = None
-                        data = raw
-                    ctype = mimetypes.guess_type(fs_path)[0] or 'application/octet-stream'
-                    self.send_response(200)
-                    self.send_header('Content-Type', ctype)
-                    if encoding:
-                        self.send_header('Content-Encoding', encoding)
-                        self.send_header('Vary', 'Accept-Encoding')
-                    self.send_header('Content-Length', str(len(data)))
-                    self.end_headers()
-                    self.wfile.write(data)
-                    return
+            # self.directory is the serving root, resolved once by the base handler
+            root = self.directory
+            ext = os.path.splitext(requested)[1].lower()
+            if ext in _COMPRESSIBLE:
+                # Resolve local filesystem path safely
+                fs_path = os.path.abspath(os.path.join(root, requested.lstrip('/')))
+                if fs_path.startswith(root + os.sep) and os.path.isfile(fs_path):
+                    ctype = _content_type(ext)
+                    st = os.stat(fs_path)
+                    # Only the chosen encoding matters, so clients share cache entries
+                    accept = self.headers.get('Accept-Encoding', '') or ''
+                    coding = _pick_encoding(accept, st.st_size)
+                    if coding and st.st_size > _STREAM_LIMIT and self.request_version == 'HTTP/1.1':
+                        f = open(fs_path, 'rb')
+                    elif coding or st.st_size <= _SMALL_FILE_LIMIT:
+                        body = _file_variant(fs_path, st.st_mtime_ns, st.st_size, coding)
+                    else:
+                        # Large uncompressed file: let the kernel copy it to the socket
+                        f = open(fs_path, 'rb')
+                        coding = ''
+                        length = os.fstat(f.fileno()).st_size
         except Exception:
             # Fall back to default handler
-            pass
+            if f is not None:
+                f.close()
+            body = f = None
+        if body is None and f is None:
+            return super().do_GET()
 
-        return super().do_GET()
+        try:
+            if body is not None:
+                self._send_body(body[1], ctype, body[0])
+            elif coding:
+                self._send_stream(f, ctype, coding)
+            else:
+                self._send_body(None, ctype, None, length=length)
+                self.copyfile(f, self.wfile)
+        except Exception as e:
+            # Headers (and maybe part of the body) are already out; a second response can't
+            # follow on this connection, so drop it instead
+            self.close_connection = True
+            self.log_error("Aborted response for %s: %s", self.path, e)
+        finally:
+            if f is not None:
+                f.close()
+
+    def _send_body(self, data: Optional[bytes], ctype: str, encoding: Optional[str],
+                   length: int = 0) -> None:
+        """Send a 200 response; with data None only the headers go out, for length body bytes."""
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(data) if data is not None else length))
+        self.end_headers()
+        if data is not None:
+            self.wfile.write(data)
+
+    def _send_stream(self, f, ctype: str, encoding: str) -> None:
+        """Send f as a 200 response compressed on the fly, 64 KiB at a time, in chunked encoding."""
+        if encoding == 'br':
+            comp = brotli.Compressor()
+            compress, finish = comp.process, comp.finish
+        else:
+            comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+            compress, finish = comp.compress, comp.flush
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        write = self.wfile.write
+        for block in iter(functools.partial(f.read, 65536), b''):
+            data = compress(block)
+            if data:
+                write(b'%x\r\n%s\r\n' % (len(data), data))
+        data = finish()
+        if data:
+            write(b'%x\r\n%s\r\n' % (len(data), data))
+        write(b'0\r\n\r\n')
 
-    def do_POST(self):
-        return super().do_POST()
+    def copyfile(self, source, outputfile):
+        # Zero-copy file bodies: socket.sendfile uses sendfile(2) where available
+        # and falls back to plain send() elsewhere
+        if outputfile is self.wfile and hasattr(source, 'fileno'):
+            self.connection.sendfile(source)
+        else:
+            super().copyfile(source, outputfile)
 
 
 def find_free_port(preferred: int) -> int:
@@ -578,20 +1133,56 @@ def find_free_port(preferred: int) -> int:
         return s.getsockname()[1]
 
 
+def _safe_open(url: str):
+    try:
+        webbrowser.open(url)
+    except Exception:
+        pass
+
+
 def open_browser_later(url: str, delay: float = 0.8):
-    def _open():
-        time.sleep(delay)
-        try:
-            webbrowser.open(url)
-        except Exception:
-            pass
-    threading.Thread(target=_open, daemon=True).start()
+    t = threading.Timer(delay, _safe_open, args=(url,))
+    t.daemon = True
+    t.start()
+
+
+# Requests handled at the same time; open keep-alive connections are not limited by it
+_DEFAULT_HTTP_THREADS = min(32, max(8, (os.cpu_count() or 1) * 2))
+
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that lets at most ``workers`` requests run at the same time.
+
+    Connections keep their own daemon threads (so idle keep-alive connections never block
+    other clients or interpreter exit); handlers take one of ``request_slots`` for each
+    request, whatever its method.
+    """
 
+    def __init__(self, server_address, handler_class, workers: int = _DEFAULT_HTTP_THREADS):
+        super().__init__(server_address, handler_class)
+        self.request_slots = threading.BoundedSemaphore(max(1, workers))
 
-def run_server(directory: str, host: str, port: int):
+
+def _build_page_in_background(ready: threading.Event) -> None:
+    try:
+        ensure_page_exists()
+    except Exception as e:
+        print(f"[BUILD] Failed to ensure page exists: {e}")
+    finally:
+        ready.set()
+
+
+def run_server(directory: str, host: str, port: int, threads: int = _DEFAULT_HTTP_THREADS):
     os.chdir(directory)
+    # Build (or validate) the page while the socket binds; only the index route waits for it
+    DevHandler.page_ready.clear()
+    threading.Thread(
+        target=_build_page_in_background, args=(DevHandler.page_ready,), daemon=True
+    ).start()
     server_address = (host, port)
-    httpd = ThreadingHTTPServer(server_address, DevHandler)
+    # Pin the serving root so handlers skip the per-request getcwd()
+    handler = functools.partial(DevHandler, directory=os.getcwd())
+    httpd = PooledHTTPServer(server_address, handler, workers=threads)
     where = f"http://{host if host not in ('0.0.0.0', '') else 'localhost'}:{port}/index.html"
     print(f"\nServing SPA from: {os.path.abspath(directory)}")
     print(f"URL: {where}")
@@ -610,16 +1201,13 @@ def main():
     parser.add_argument("-d", "--dir", default=".", help="Directory to serve (default: current directory)")
     parser.add_argument("-H", "--host", default="127.0.0.1", help="Host/IP to bind (default: 127.0.0.1)")
     parser.add_argument("-p", "--port", type=int, default=0, help="Port to bind (default: auto-pick)")
+    parser.add_argument("--threads-http", type=int, default=_DEFAULT_HTTP_THREADS,
+                        help="Requests handled at the same time "
+                             f"(default: {_DEFAULT_HTTP_THREADS})")
     args = parser.parse_args()
 
-    # Ensure a timestamped page exists in /page before starting
-    try:
-        ensure_page_exists()
-    except Exception as e:
-        print(f"[BUILD] Failed to ensure page exists: {e}")
-
     port = find_free_port(args.port)
-    run_server(args.dir, args.host, port)
+    run_server(args.dir, args.host, port, args.threads_http)
 
 
 if __name__ == "__main__":
@@ -23,19 +23,40 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import inspect
+import io
 import json
 import os
 import re
+import shutil
 import sys
 import tempfile
-from typing import Any, List, Optional, Tuple
-
-
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # comes with ocp-tessellate; only used to pack vertex buffers
+    np = None
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: faster writing of the float-heavy output
+    orjson = None
+try:
+    import pyjson5  # type: ignore
+except ImportError:  # optional: native JSON5 parsing of the exported JS literal
+    pyjson5 = None
+
+
+@functools.lru_cache(maxsize=None)
 def _try_import_builders():
     """Try to import a CAD importer. Return a tuple (backend, importer_fn).
 
     backend is one of: 'build123d', 'cadquery'
     importer_fn(path) -> list of shapes or a single shape
+    The lookup runs once per process; later calls return the cached result.
     """
     # Try build123d first (modern)
     try:
@@ -71,35 +92,30 @@ def _try_import_builders():
     return (None, None)
 
 
-def _to_sequence(shapes_obj) -> List[Any]:
-    """Normalize shapes into a list."""
-    if shapes_obj is None:
-        return []
-    if isinstance(shapes_obj, (list, tuple)):
-        return list(shapes_obj)
-    return [shapes_obj]
-
-
-def _normalize_cad_objects(shapes: List[Any]) -> List[Any]:
-    """Best-effort normalization for cadquery/build123d containers.
+def _iter_normalized(shapes_obj: Any) -> Iterator[Any]:
+    """Yield the shapes of an importer result, with best-effort normalization for
+    cadquery/build123d containers.
 
+    - None yields nothing; a list/tuple yields its items, anything else itself
     - If given a cadquery Workplane, expand to its .objects
     - If given a cadquery Compound, expand to its Solids()
-    - Otherwise, return as-is
+    - Otherwise, yield as-is
     """
-    out: List[Any] = []
+    if shapes_obj is None:
+        return
+    shapes = shapes_obj if isinstance(shapes_obj, (list, tuple)) else (shapes_obj,)
     for s in shapes:
         try:
             # cadquery Workplane has .objects list of shapes
             objs = getattr(s, "objects", None)
             if isinstance(objs, (list, tuple)) and objs:
-                out.extend(list(objs))
+                yield from objs
                 continue
             # cadquery Compound has .Solids()/.solids()
             if hasattr(s, "Solids") and callable(getattr(s, "Solids")):
                 sols = s.Solids()
                 if isinstance(sols, (list, tuple)) and sols:
-                    out.extend(list(sols))
+                    yield from sols
                     continue
             if hasattr(s, "solids") and callable(getattr(s, "solids")):
                 sols = s.solids()
@@ -108,18 +124,19 @@ def _normalize_cad_objects(shapes: List[Any]) -> List[Any]:
                 except Exception:
                     pass
                 if isinstance(sols, (list, tuple)) and sols:
-                    out.extend(list(sols))
+                    yield from sols
                     continue
         except Exception:
             pass
-        out.append(s)
-    return out
+        yield s
 
 
+@functools.lru_cache(maxsize=None)
 def _try_import_ocp():
     """Try to import OCCT exploration utilities from OCP. Returns a tuple or None.
 
-    On success returns (TopoDS_Shape, TopoDS_Compound, TopExp_Explorer, TopAbs)
+    On success returns (TopoDS_Shape, TopoDS_Compound, TopExp_Explorer, TopAbs).
+    Cached, since it is called for every shape on each flattening pass.
     """
     try:
         from OCP.TopoDS import TopoDS_Shape, TopoDS_Compound  # type: ignore
@@ -131,6 +148,41 @@ def _try_import_ocp():
         return None
 
 
+# TopExp_Explorer constructor pattern that worked for the installed OCP, found on first use
+_EXPLORER_FACTORY: Optional[Callable[[Any, Any], Any]] = None
+
+
+def _make_explorer(t: Any, kind: Any) -> Any:
+    """Create a TopExp_Explorer over t for sub-shapes of kind; None if no pattern works.
+
+    OCP variants differ in constructor signatures; the first one that succeeds is
+    remembered so later calls construct directly without probing.
+    """
+    global _EXPLORER_FACTORY
+    if _EXPLORER_FACTORY is not None:
+        return _EXPLORER_FACTORY(t, kind)
+    _TopoDS_Shape, _TopoDS_Compound, TopExp_Explorer, TopAbs = _try_import_ocp()
+
+    def _init_explorer(t, kind):
+        exp = TopExp_Explorer()
+        exp.Init(t, kind)
+        return exp
+
+    candidates = (
+        lambda t, kind: TopExp_Explorer(t, kind),
+        lambda t, kind: TopExp_Explorer(t, kind, TopAbs.TopAbs_SHAPE),
+        _init_explorer,
+    )
+    for factory in candidates:
+        try:
+            exp = factory(t, kind)
+        except Exception:
+            continue
+        _EXPLORER_FACTORY = factory
+        return exp
+    return None
+
+
 def _explode_compound_to_supported(shape: Any) -> List[Any]:
     """Explode a compound into supported sub-shapes (Solids -> Shells -> Faces).
 
@@ -160,22 +212,8 @@ def _explode_compound_to_supported(shape: Any) -> List[Any]:
 
     def _collect_from(t, kind):
         out = []
-        exp = None
-        # Try multiple constructor signatures and Init pattern across OCP variants
-        try:
-            exp = TopExp_Explorer(t, kind)
-        except Exception:
-            try:
-                exp = TopExp_Explorer(t, kind, TopAbs.TopAbs_SHAPE)
-            except Exception:
-                try:
-                    exp = TopExp_Explorer()
-                    try:
-                        exp.Init(t, kind)
-                    except Exception:
-                        exp = None
-                except Exception:
-                    exp = None
+        # Errors from the remembered constructor reach the outer try below
+        exp = _make_explorer(t, kind)
         if exp is None:
             return []
         try:
@@ -228,13 +266,63 @@ def _explode_compound_to_supported(shape: Any) -> List[Any]:
         return [shape]
 
 
-def _flatten_shapes(shapes: List[Any]) -> List[Any]:
-    """Flatten a list of shapes, exploding compounds into supported primitives."""
-    flat: List[Any] = []
-    for s in shapes:
-        parts = _explode_compound_to_supported(s)
-        flat.extend(parts)
-    return flat
+def _iter_primitives(roots: Iterable[Any], max_depth: int = 5) -> Iterator[Any]:
+    """Yield the supported primitives of roots in order, exploding compounds depth-first.
+
+    Each shape is inspected once; compounds nested deeper than max_depth are yielded as-is.
+    """
+    for root in roots:
+        stack = [(root, 0)]
+        while stack:
+            shape, depth = stack.pop()
+            if depth < max_depth and _looks_like_compound(shape):
+                parts = _explode_compound_to_supported(shape)
+                if not (len(parts) == 1 and parts[0] is shape):
+                    stack.extend((p, depth + 1) for p in reversed(parts))
+                    continue
+            yield shape
+
+
+# Shapes whose bounding box diagonal is below this fraction of the largest one are dropped
+_MIN_RELATIVE_SIZE = 1e-9
+
+
+def _prune_shapes(shapes: List[Any]) -> List[Any]:
+    """Drop shapes that would tessellate to nothing visible before meshing.
+
+    Removes exact duplicates (same TShape at the same location) and shapes with an
+    empty or vanishingly small bounding box, e.g. leftover construction geometry.
+    Returns shapes unchanged if OCP's bounding box tools are unavailable.
+    """
+    try:
+        from OCP.Bnd import Bnd_Box  # type: ignore
+        from OCP.BRepBndLib import BRepBndLib  # type: ignore
+    except Exception:
+        return shapes
+    add_to_box = getattr(BRepBndLib, "Add_s", None) or getattr(BRepBndLib, "Add")
+
+    kept: List[Tuple[Any, float]] = []
+    seen: dict = {}
+    for shape in shapes:
+        topo = getattr(shape, "wrapped", shape)
+        try:
+            bucket = seen.setdefault(hash(topo), [])
+            if any(topo.IsEqual(other) for other in bucket):
+                continue
+            bucket.append(topo)
+            box = Bnd_Box()
+            add_to_box(topo, box)
+            if box.IsVoid():
+                continue
+            xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
+            size = ((xmax - xmin) ** 2 + (ymax - ymin) ** 2 + (zmax - zmin) ** 2) ** 0.5
+        except Exception:
+            size = float("inf")  # could not classify: keep it
+        kept.append((shape, size))
+    if not kept:
+        return shapes
+    largest = max((size for _, size in kept if size != float("inf")), default=0.0)
+    return [shape for shape, size in kept if size >= largest * _MIN_RELATIVE_SIZE]
 
 
 def _looks_like_compound(obj: Any) -> bool:
@@ -258,6 +346,21 @@ def _looks_like_compound(obj: Any) -> bool:
         return False
 
 
+# JS -> JSON rewrite in a single scan: string literals are matched first and left
+# alone, bare object keys get quoted and commas before a closing bracket are dropped.
+_JS_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|([A-Za-z_$][\w$]*)(\s*:)|,(\s*[}\]])')
+_JS_ASSIGN_RE = re.compile(r"\s*(?:export\s+)?(?:const|var|let)\s+[a-zA-Z_$][\w$]*\s*=\s*")
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _js_token_to_json(m: re.Match) -> str:
+    if m.group(1) is not None:
+        return f'"{m.group(1)}"{m.group(2)}'
+    if m.group(3) is not None:
+        return m.group(3)
+    return m.group(0)
+
+
 def _parse_js_object_literal(text: str) -> Any:
     """Very small helper to turn a JS-like object literal into JSON, then parse.
 
@@ -267,32 +370,278 @@ def _parse_js_object_literal(text: str) -> Any:
         var NAME = { version: 3, parts: [ ... ], };
 
     We:
-      - strip any leading `var NAME =` or `const NAME =` or `export const NAME =`
-      - remove trailing semicolon
-      - quote bare keys
-      - remove trailing commas
-    Then json.loads() the result.
+      - skip any leading `var NAME =` or `const NAME =` or `export const NAME =`
+      - decode strict JSON directly (with orjson when installed) when the literal
+        already is JSON
+      - otherwise parse it as JSON5 with pyjson5 when installed, or else
+        quote bare keys and remove trailing commas in one pass
+    and decode from the first `{`, ignoring whatever follows the object (e.g. `;`).
     """
-    src = text.strip()
-    # Remove leading assignment patterns
-    src = re.sub(r"^(?:export\s+)?(?:const|var|let)\s+[a-zA-Z_$][\w$]*\s*=\s*", "", src)
-    # Remove trailing semicolon
-    src = re.sub(r";\s*$", "", src)
-
-    # Find first object start and last end to cut unrelated code
-    start = src.find("{")
-    end = src.rfind("}")
-    if start == -1 or end == -1 or end < start:
+    m = _JS_ASSIGN_RE.match(text)
+    start = text.find("{", m.end() if m else 0)
+    if start == -1:
         raise ValueError("Could not locate object literal in JS text")
-    src = src[start : end + 1]
+    end = text.rfind("}")
+    # Current ocp-tessellate emits strict JSON after the assignment: decode it in C
+    try:
+        if orjson is not None:
+            return orjson.loads(text[start : end + 1])
+        return _JSON_DECODER.raw_decode(text, start)[0]
+    except ValueError:
+        pass
+    if pyjson5 is not None:
+        try:
+            return pyjson5.decode(text[start : end + 1])
+        except Exception:
+            pass  # fall back to the regex rewrite below
+    src = _JS_TOKEN_RE.sub(_js_token_to_json, text[start:])
+    try:
+        return _JSON_DECODER.raw_decode(src)[0]
+    except ValueError as e:
+        raise ValueError(f"Could not parse object literal in JS text: {e}") from e
+
+
+# Converted JSON is cached per input content + options; bump when the output format changes
+_CACHE_VERSION = "1"
+
+
+def _cache_dir() -> str:
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "3d-resume", "step-json")
+
+
+@functools.lru_cache(maxsize=None)
+def _exporter_version() -> str:
+    """Installed ocp-tessellate version, or '' if unknown.
+
+    Exporter upgrades can change the output, so the version is part of the cache key.
+    """
+    try:
+        from importlib.metadata import version
+        return version("ocp-tessellate")
+    except Exception:
+        return ""
+
+
+def _cache_path(input_path: str, options: Tuple[Any, ...]) -> str:
+    """Cache file for input_path's content converted with options."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(input_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    h.update(repr((_CACHE_VERSION, _exporter_version()) + options).encode("utf-8"))
+    return os.path.join(_cache_dir(), h.hexdigest() + ".json")
+
+
+# Per-shape tessellation buffers and the dtypes the viewer uploads them as
+# (Float32Array/Uint32Array)
+_BUFFER_DTYPES = {
+    "vertices": "float32",
+    "normals": "float32",
+    "edges": "float32",
+    "obj_vertices": "float32",
+    "triangles": "uint32",
+}
+
+# Output is written with packed float32/uint32 buffers when both orjson and numpy are present
+_PACKED_OUTPUT = orjson is not None and np is not None
+
+
+def _packed(group: dict) -> dict:
+    """Copy of a viewer part group with tessellation buffers as float32/uint32 numpy arrays.
+
+    Float32 is the precision three.js renders with anyway; serialized through orjson the
+    arrays are written without per-element Python objects and with shorter float text.
+    """
+    out = dict(group)
+    parts = []
+    for part in group.get("parts", []):
+        if isinstance(part, dict) and "parts" in part:
+            part = _packed(part)
+        elif isinstance(part, dict) and isinstance(part.get("shape"), dict):
+            shape = dict(part["shape"])
+            for key, dtype in _BUFFER_DTYPES.items():
+                if isinstance(shape.get(key), list):
+                    try:
+                        shape[key] = np.asarray(shape[key], dtype=dtype)
+                    except (TypeError, ValueError):
+                        pass  # ragged or non-numeric: leave the list as is
+            part = dict(part, shape=shape)
+        parts.append(part)
+    out["parts"] = parts
+    return out
+
+
+def _export_js(
+    export_fn: Any,
+    base: str,
+    shapes: List[Any],
+    names: List[str],
+    angle: float,
+    deflection: float,
+    color: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """Run ocp-tessellate's JS exporter; returns (JS text, whether color was applied).
+
+    Without a filename the exporter returns the JS instead of writing it, so the
+    (possibly many MB) tessellation never round-trips through a temp file.
+    Options the installed exporter does not accept are left out.
+    """
+    # pass through tessellation quality if supported
+    options: dict = {"angular_tolerance": angle, "linear_tolerance": deflection}
+    if color:
+        options["colors"] = [color] * len(shapes)
+    params = _exporter_params(export_fn)
+    if params is not None:
+        options = {k: v for k, v in options.items() if k in params}
+    return export_fn(base, *shapes, names=names, **options), "colors" in options
+
+
+@functools.lru_cache(maxsize=None)
+def _exporter_params(export_fn: Any) -> Optional[frozenset]:
+    """Keyword names export_fn accepts; None if it takes **kwargs or has no signature."""
+    try:
+        params = inspect.signature(export_fn).parameters
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return None
+    return frozenset(params)
+
+
+def _apply_color(data: dict, color: str) -> None:
+    """Override the color of top-level parts, for exporters that ignored the colors argument."""
+    try:
+        for p in data.get("parts", []):
+            if isinstance(p, dict):
+                if "color" in p:
+                    p["color"] = color
+    except Exception:
+        pass
+
+
+def _tessellate_one(task: Tuple[str, Any, str, float, float, Optional[str]]) -> dict:
+    """Export a single shape and return its parsed viewer data (process pool worker)."""
+    base, shape, name, angle, deflection, color = task
+    from ocp_tessellate.convert import export_three_cad_viewer_js  # type: ignore
+
+    js_text, colored = _export_js(
+        export_three_cad_viewer_js, base, [shape], [name], angle, deflection, color
+    )
+    data = _parse_js_object_literal(js_text)
+    if color and not colored:
+        _apply_color(data, color)
+    return data
+
+
+def _merge_exports(results: List[dict]) -> dict:
+    """Combine single-shape exports into one model: parts concatenated, bounding boxes unioned."""
+    data = dict(results[0])
+    parts: List[Any] = []
+    bb: Optional[dict] = None
+    for res in results:
+        parts.extend(res.get("parts", []))
+        res_bb = res.get("bb")
+        if not isinstance(res_bb, dict):
+            continue
+        if bb is None:
+            bb = dict(res_bb)
+            continue
+        for key, value in res_bb.items():
+            if key in bb:
+                bb[key] = min(bb[key], value) if key.endswith("min") else max(bb[key], value)
+    data["parts"] = parts
+    if bb is not None:
+        data["bb"] = bb
+    return data
+
+
+def _tessellate_parallel(
+    base: str,
+    shapes: List[Any],
+    names: List[str],
+    angle: float,
+    deflection: float,
+    color: Optional[str],
+    jobs: int,
+) -> Optional[dict]:
+    """Tessellate shapes in worker processes.
+
+    Returns None if that is not possible (e.g. unpicklable shapes).
+    """
+    tasks = [(base, s, n, angle, deflection, color) for s, n in zip(shapes, names)]
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            return _merge_exports(list(pool.map(_tessellate_one, tasks)))
+    except Exception as e:
+        sys.stderr.write(f"Parallel tessellation failed ({e}); retrying in one process\n")
+        return None
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """Create the directory path will be written into, unless it already exists."""
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.isdir(out_dir):
+        os.makedirs(out_dir, exist_ok=True)
+
+
+def _require_exporter():
+    try:
+        from ocp_tessellate.convert import export_three_cad_viewer_js  # type: ignore
+    except Exception as e:
+        raise RuntimeError(
+            "Missing dependency 'ocp-tessellate'. Install with: pip install ocp-tessellate"
+        ) from e
+    return export_three_cad_viewer_js
 
-    # Quote bare keys: from key: to "key":
-    # Note: keep it conservative to avoid touching strings
-    src = re.sub(r"(?m)(^|[,{\s])([a-zA-Z_][a-zA-Z0-9_]*)\s*:", r'\1"\2":', src)
-    # Remove trailing commas in objects/arrays
-    src = re.sub(r",\s*([}\]])", r"\1", src)
 
-    return json.loads(src)
+def _shapes_to_json(
+    shapes_obj: Any,
+    base: str,
+    output_path: str,
+    *,
+    source: str,
+    color: Optional[str],
+    deflection: float,
+    angle: float,
+    jobs: int,
+) -> dict:
+    """Tessellate imported shapes, write the viewer JSON to output_path and return it."""
+    export_three_cad_viewer_js = _require_exporter()
+    # Normalize potential cadquery/build123d containers (Workplanes, Compounds), then
+    # flatten compounds to supported primitives to avoid passing
+    # TopoDS_Compound into the exporter (which raises Unknown type errors)
+    shapes = _prune_shapes(list(_iter_primitives(_iter_normalized(shapes_obj))))
+    if not shapes:
+        raise RuntimeError(f"No shapes found in input: {source}")
+
+    # Export as JS (ocp-tessellate currently provides JS; we'll parse to JSON)
+    names = [f"{base}_{i}" for i in range(len(shapes))]
+    data: Optional[dict] = None
+    if jobs > 1 and len(shapes) > 1:
+        data = _tessellate_parallel(base, shapes, names, angle, deflection, color, jobs)
+    if data is None:
+        js_text, colored = _export_js(
+            export_three_cad_viewer_js, base, shapes, names, angle, deflection, color
+        )
+        data = _parse_js_object_literal(js_text)
+        # Optionally override color if requested and the exporter could not apply it
+        if color and not colored:
+            _apply_color(data, color)
+
+    # Ensure strict JSON is written
+    if orjson is not None:
+        blob = orjson.dumps(_packed(data) if _PACKED_OUTPUT else data,
+                            option=orjson.OPT_SERIALIZE_NUMPY)
+        with open(output_path, "wb") as f:
+            f.write(blob)
+        if _PACKED_OUTPUT:
+            # Return what was written (float32-rounded), as a later cache hit reads it back
+            data = orjson.loads(blob)
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    return data
 
 
 def convert_step_to_json(
@@ -303,11 +652,35 @@ def convert_step_to_json(
     color: Optional[str] = None,
     deflection: float = 0.1,
     angle: float = 12.0,
+    jobs: int = 1,
+    use_cache: bool = True,
 ) -> dict:
     """Convert a STEP (or other supported) file to three-cad-viewer JSON.
 
+    With jobs > 1, independent shapes are tessellated in that many worker processes.
+    Results are cached under ~/.cache/3d-resume/step-json keyed by the input content
+    and options, so converting an unchanged file again skips tessellation.
     Returns the JSON object (also written to output_path).
     """
+    _ensure_parent_dir(output_path)
+    # The output embeds base (var and part names), so it is part of the cache key
+    base = model_name or os.path.splitext(os.path.basename(input_path))[0]
+    cache_path = None
+    if use_cache:
+        # Parallel runs merge per-shape exports, and packing rounds buffers to float32:
+        # both change the document, so both are part of the key
+        cache_path = _cache_path(
+            input_path, (base, color, deflection, angle, jobs > 1, _PACKED_OUTPUT)
+        )
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        else:
+            shutil.copyfile(cache_path, output_path)
+            return data
+
     # Import a builder backend
     backend, importer = _try_import_builders()
     if not importer:
@@ -315,107 +688,97 @@ def convert_step_to_json(
             "No CAD importer found. Please install either 'build123d' or 'cadquery'."
         )
 
-    try:
-        from ocp_tessellate.convert import export_three_cad_viewer_js  # type: ignore
-    except Exception as e:
-        raise RuntimeError(
-            "Missing dependency 'ocp-tessellate'. Install with: pip install ocp-tessellate"
-        ) from e
-
+    _require_exporter()
     shapes_obj = importer(input_path)
-    original = _to_sequence(shapes_obj)
-    # First, normalize potential cadquery/build123d containers (Workplanes, Compounds)
-    shapes = _normalize_cad_objects(list(original))
-    # Iteratively flatten compounds to supported primitives to avoid passing
-    # TopoDS_Compound into the exporter (which raises Unknown type errors)
-    for _ in range(5):  # depth guard
-        if any(_looks_like_compound(s) for s in shapes):
-            shapes = _flatten_shapes(shapes)
-        else:
-            break
-    if not shapes:
-        raise RuntimeError(f"No shapes found in input file: {input_path}")
-
-    # Export as JS (ocp-tessellate currently provides JS; we'll parse to JSON)
-    base = model_name or os.path.splitext(os.path.basename(input_path))[0]
-    with tempfile.TemporaryDirectory() as td:
-        js_path = os.path.join(td, f"{base}.js")
-        # Call exporter; it accepts multiple ocp shapes as positional args
-        names = [f"{base}_{i}" for i in range(len(shapes))]
+    data = _shapes_to_json(
+        shapes_obj,
+        base,
+        output_path,
+        source=input_path,
+        color=color,
+        deflection=deflection,
+        angle=angle,
+        jobs=jobs,
+    )
+
+    if cache_path:
         try:
-            try:
-                export_three_cad_viewer_js(
-                    base,
-                    *shapes,
-                    names=names,
-                    filename=js_path,
-                    # pass through tessellation quality if supported
-                    angular_tolerance=angle,
-                    linear_tolerance=deflection,
-                )
-            except TypeError:
-                # Fallback for older ocp-tessellate versions without tolerance args
-                export_three_cad_viewer_js(
-                    base,
-                    *shapes,
-                    names=names,
-                    filename=js_path,
-                )
-        except Exception as e:
-            # Last-ditch attempt: if compounds slipped through, explode and retry once
-            msg = str(e)
-            if "TopoDS_Compound" in msg or "Compound" in msg:
-                retry_shapes: List[Any] = []
-                for s in shapes:
-                    retry_shapes.extend(_explode_compound_to_supported(s))
-                if retry_shapes:
-                    shapes = retry_shapes
-                    names = [f"{base}_{i}" for i in range(len(shapes))]
-                    try:
-                        try:
-                            export_three_cad_viewer_js(
-                                base,
-                                *shapes,
-                                names=names,
-                                filename=js_path,
-                                angular_tolerance=angle,
-                                linear_tolerance=deflection,
-                            )
-                        except TypeError:
-                            export_three_cad_viewer_js(
-                                base,
-                                *shapes,
-                                names=names,
-                                filename=js_path,
-                            )
-                    except Exception:
-                        raise
-                else:
-                    raise
-            else:
-                raise
-
-        with open(js_path, "r", encoding="utf-8") as f:
-            js_text = f.read()
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            shutil.copyfile(output_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            sys.stderr.write(f"Warning: could not write conversion cache: {e}\n")
 
-    data = _parse_js_object_literal(js_text)
+    return data
 
-    # Optionally override color if requested
-    if color:
-        try:
-            for p in data.get("parts", []):
-                if isinstance(p, dict):
-                    if "color" in p:
-                        p["color"] = color
-        except Exception:
-            pass
 
-    # Ensure strict JSON is written
-    os.makedirs(os.path.dirname(os.path.abspath(output_path)) or ".", exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+def _read_step_stream(data: bytes) -> Optional[Any]:
+    """Read STEP data from memory with OCP's STEPControl_Reader.ReadStream.
 
-    return data
+    Returns the transferred TopoDS_Shape, or None when OCP or a stream-capable
+    binding of ReadStream is unavailable.
+    """
+    try:
+        from OCP.IFSelect import IFSelect_RetDone  # type: ignore
+        from OCP.STEPControl import STEPControl_Reader  # type: ignore
+    except Exception:
+        return None
+    reader = STEPControl_Reader()
+    if not hasattr(reader, "ReadStream"):
+        return None
+    try:
+        status = reader.ReadStream("stream", io.BytesIO(data))
+    except TypeError:
+        # binding without std::istream support
+        return None
+    if status != IFSelect_RetDone:
+        raise RuntimeError("Could not read STEP data from stream")
+    reader.TransferRoots()
+    return reader.OneShape()
+
+
+def convert_step_stream_to_json(
+    data: bytes,
+    output_path: str,
+    *,
+    model_name: str = "model",
+    color: Optional[str] = None,
+    deflection: float = 0.1,
+    angle: float = 12.0,
+    jobs: int = 1,
+) -> dict:
+    """Convert in-memory STEP data (e.g. downloaded or from an archive) to three-cad-viewer JSON.
+
+    The data is read directly from memory when OCP supports it; otherwise it is written
+    to a temporary file and converted with convert_step_to_json().
+    """
+    shape = _read_step_stream(data)
+    if shape is None:
+        with tempfile.TemporaryDirectory() as td:
+            step_path = os.path.join(td, f"{model_name}.step")
+            with open(step_path, "wb") as f:
+                f.write(data)
+            return convert_step_to_json(
+                step_path,
+                output_path,
+                model_name=model_name,
+                color=color,
+                deflection=deflection,
+                angle=angle,
+                jobs=jobs,
+            )
+    _ensure_parent_dir(output_path)
+    return _shapes_to_json(
+        shape,
+        model_name,
+        output_path,
+        source="<stream>",
+        color=color,
+        deflection=deflection,
+        angle=angle,
+        jobs=jobs,
+    )
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -426,6 +789,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--color", dest="color", default=None, help="Hex color override, e.g. #ff0000")
     p.add_argument("--deflection", dest="deflection", type=float, default=0.1, help="Linear deflection (tessellation)")
     p.add_argument("--angle", dest="angle", type=float, default=12.0, help="Angular tolerance in degrees")
+    p.add_argument("--jobs", dest="jobs", type=int, default=1,
+                   help="Worker processes for tessellation")
+    p.add_argument("--no-cache", dest="cache", action="store_false", help="Always re-tessellate")
 
     args = p.parse_args(argv)
 
@@ -437,6 +803,8 @@ def main(argv: Optional[List[str]] = None) -> int:
             color=args.color,
             deflection=args.deflection,
             angle=args.angle,
+            jobs=args.jobs,
+            use_cache=args.cache,
         )
     except Exception as e:
         sys.stderr.write(f"Error: {e}\n")
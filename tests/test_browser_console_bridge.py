@@ -38,74 +38,90 @@ class Server:
         return f"http://{self.host}:{self.port}"
 
 
+@unittest.skipUnless(HAVE_PLAYWRIGHT, "Playwright not installed")
 class BrowserEmulationTest(unittest.TestCase):
-    @unittest.skipUnless(HAVE_PLAYWRIGHT, "Playwright not installed")
-    def test_browser_has_no_errors_and_viewer_mounts_canvas(self):
-        # Ensure a fresh page exists
+    # Chromium launch dominates run time, so the browser, the generated page
+    # and the server are shared by every test in the class
+    @classmethod
+    def setUpClass(cls):
         main.ensure_page_exists(force=True)
-        srv = Server()
+        cls._srv = Server()
+        cls._srv.start()
+        cls._pw = sync_playwright().start()
+        try:
+            cls._browser = cls._pw.chromium.launch(headless=True)
+        except Exception:
+            cls._pw.stop()
+            cls._srv.stop()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._browser.close()
+        cls._pw.stop()
+        cls._srv.stop()
+
+    def test_browser_has_no_errors_and_viewer_mounts_canvas(self):
+        srv = self._srv
+        page = self._browser.new_page()
         try:
-            srv.start()
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-
-                console_entries = []
-                page_errors = []
-
-                def on_console(msg):
-                    try:
-                        console_entries.append({
-                            "type": msg.type(),
-                            "text": msg.text(),
-                        })
-                    except Exception:
-                        pass
-
-                def on_page_error(exc):
-                    try:
-                        page_errors.append(str(exc))
-                    except Exception:
-                        page_errors.append("<unserializable pageerror>")
-
-                page.on("console", on_console)
-                page.on("pageerror", on_page_error)
-
-                page.goto(f"{srv.base}/index.html", wait_until="domcontentloaded")
-
-                # Ensure work cards and viewer container exist
-                self.assertIsNotNone(page.query_selector(".work-card"))
-                self.assertIsNotNone(page.query_selector(".viewer-canvas"))
-
-                # Wait for the viewer to mount some content into the container (child element appears)
-                # Give enough time for WASM/module to load in CI
-                page.wait_for_selector(".viewer-canvas *", timeout=15000)
-
-                # Try clicking Fit View if the button is present
-                btn = page.query_selector("button[data-action='fit']")
-                if btn:
-                    btn.click()
-
-                # Evaluate console health
-                # Fail on any pageerror
-                self.assertEqual(page_errors, [], f"Page errors occurred: {page_errors}")
-
-                # Collect console errors
-                error_texts = [e["text"] for e in console_entries if e.get("type") == "error"]
-                self.assertEqual(error_texts, [], f"Console errors: {error_texts}")
-
-                # Also fail if known failure warnings/messages appear
-                red_flags = [
-                    "Failed to construct CadViewer with both signatures",
-                    "Viewer initialization failed (init/initialize)",
-                    "Auto-load from URL failed",
-                ]
-                bad_warns = [e["text"] for e in console_entries if any(flag in e.get("text", "") for flag in red_flags)]
-                self.assertEqual(bad_warns, [], f"Viewer warnings indicate failure: {bad_warns}")
-
-                browser.close()
+            console_entries = []
+            page_errors = []
+
+            def on_console(msg):
+                try:
+                    console_entries.append({
+                        "type": msg.type(),
+                        "text": msg.text(),
+                    })
+                except Exception:
+                    pass
+
+            def on_page_error(exc):
+                try:
+                    page_errors.append(str(exc))
+                except Exception:
+                    page_errors.append("<unserializable pageerror>")
+
+            page.on("console", on_console)
+            page.on("pageerror", on_page_error)
+
+            page.goto(f"{srv.base}/index.html", wait_until="domcontentloaded")
+
+            # Ensure work cards and viewer container exist
+            self.assertIsNotNone(page.query_selector(".work-card"))
+            self.assertIsNotNone(page.query_selector(".viewer-canvas"))
+
+            # Wait for the viewer to mount some content into the container (child element appears)
+            # Give enough time for WASM/module to load in CI
+            page.wait_for_selector(".viewer-canvas *", timeout=15000)
+
+            # Try clicking Fit View if the button is present
+            btn = page.query_selector("button[data-action='fit']")
+            if btn:
+                btn.click()
+
+            # Evaluate console health
+            # Fail on any pageerror
+            self.assertEqual(page_errors, [], f"Page errors occurred: {page_errors}")
+
+            # Collect console errors
+            error_texts = [e["text"] for e in console_entries if e.get("type") == "error"]
+            self.assertEqual(error_texts, [], f"Console errors: {error_texts}")
+
+            # Also fail if known failure warnings/messages appear
+            red_flags = [
+                "Failed to construct CadViewer with both signatures",
+                "Viewer initialization failed (init/initialize)",
+                "Auto-load from URL failed",
+            ]
+            bad_warns = [
+                e["text"] for e in console_entries
+                if any(flag in e.get("text", "") for flag in red_flags)
+            ]
+            self.assertEqual(bad_warns, [], f"Viewer warnings indicate failure: {bad_warns}")
         finally:
-            srv.stop()
+            page.close()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import mmap
 import os
 import unittest
 
@@ -8,59 +9,72 @@ class FrontendJsTest(unittest.TestCase):
         self.app_js_path = os.path.join(self.repo_root, 'assets', 'js', 'app.js')
         self.template_path = os.path.join(self.repo_root, 'assets', 'html', 'template.html')
 
-    def test_new_viewer_display_code_is_used(self):
-        # Ensure the front-end uses the new three-cad-viewer API (no legacy CadViewer compatibility).
-        self.assertTrue(os.path.exists(self.app_js_path), f"Missing {self.app_js_path}")
-        with open(self.app_js_path, 'r', encoding='utf-8') as f:
-            js = f.read()
-
-        # 1) Use named imports for new API and use local self-hosted module (no @latest, no CDN)
-        self.assertIn("import { Viewer, Display }", js)
-        self.assertIn("/assets/js/vendor/three-cad-viewer.esm.js", js)
-        self.assertNotIn("three-cad-viewer@latest", js)
-        self.assertNotIn("https://unpkg.com/three-cad-viewer", js)
-
-        # 2) No legacy compatibility helpers or CadViewer constructor anywhere
-        for legacy in [
-            "resolveCadViewer",
-            "CadViewer",
-            "mod.CadViewer",
-            "mod.default && mod.default.CadViewer",
-            "ThreeCadViewer",
-        ]:
-            self.assertNotIn(legacy, js)
-
-        # 3) Expect modern Display/Viewer creation and options blocks
-        self.assertIn("new Display(", js)
-        self.assertIn("new Viewer(", js)
-        self.assertIn("defaultDisplayOptions", js)
-        self.assertIn("defaultRenderOptions", js)
-        self.assertIn("defaultViewerOptions", js)
+    def assertContents(self, path, required=(), forbidden=()):
+        """Check byte needles against one read-only mapping of path."""
+        self.assertTrue(os.path.exists(path), f"Missing {path}")
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for needle in required:
+                self.assertNotEqual(mm.find(needle), -1, f"{needle!r} not found in {path}")
+            for needle in forbidden:
+                self.assertEqual(mm.find(needle), -1, f"{needle!r} unexpectedly found in {path}")
 
-        # 4) edgeColor is allowed in new render options (matches the official skeleton)
-        self.assertIn("edgeColor:", js)
-
-        # 5) Basic load helpers should use new viewer methods if present but may fallback gracefully
-        for method in ["addModelUrl", "loadModelFromUrl", "loadUrl", "loadModel", "openUrl"]:
-            self.assertIn(method, js)
-
-        # 6) DOMContentLoaded wiring present
-        self.assertIn("document.addEventListener('DOMContentLoaded', initWorkCards)", js)
-
-        # 7) Avoid noisy console.log and no client-console bridge remnants
-        self.assertNotIn("console.log(", js)
-        self.assertNotIn("/__console", js)
-        self.assertNotIn("setupConsoleBridge", js)
+    def test_new_viewer_display_code_is_used(self):
+        # Ensure the front-end uses the new three-cad-viewer API
+        # (no legacy CadViewer compatibility).
+        self.assertContents(
+            self.app_js_path,
+            required=[
+                # 1) Use named imports for new API and use local self-hosted module
+                #    (no @latest, no CDN)
+                b"import { Viewer, Display }",
+                b"/assets/js/vendor/three-cad-viewer.esm.js",
+                # 3) Expect modern Display/Viewer creation and options blocks
+                b"new Display(",
+                b"new Viewer(",
+                b"defaultDisplayOptions",
+                b"defaultRenderOptions",
+                b"defaultViewerOptions",
+                # 4) edgeColor is allowed in new render options (matches the official skeleton)
+                b"edgeColor:",
+                # 5) Basic load helpers should use new viewer methods if present but may
+                #    fallback gracefully
+                b"addModelUrl",
+                b"loadModelFromUrl",
+                b"loadUrl",
+                b"loadModel",
+                b"openUrl",
+                # 6) DOMContentLoaded wiring present
+                b"document.addEventListener('DOMContentLoaded', initWorkCards)",
+            ],
+            forbidden=[
+                b"three-cad-viewer@latest",
+                b"https://unpkg.com/three-cad-viewer",
+                # 2) No legacy compatibility helpers or CadViewer constructor anywhere
+                b"resolveCadViewer",
+                b"CadViewer",
+                b"mod.CadViewer",
+                b"mod.default && mod.default.CadViewer",
+                b"ThreeCadViewer",
+                # 7) Avoid noisy console.log and no client-console bridge remnants
+                b"console.log(",
+                b"/__console",
+                b"setupConsoleBridge",
+            ],
+        )
 
         # 8) Template should modulepreload the local self-hosted ESM (no CDN, no @latest)
-        self.assertTrue(os.path.exists(self.template_path), f"Missing {self.template_path}")
-        with open(self.template_path, 'r', encoding='utf-8') as tf:
-            tpl = tf.read()
-        self.assertIn("/assets/js/vendor/three-cad-viewer.esm.js", tpl)
-        # CSS should be loaded from vendor folder as well
-        self.assertIn("/assets/css/vendor/three-cad-viewer.css", tpl)
-        self.assertNotIn("three-cad-viewer@latest", tpl)
-        self.assertNotIn("https://unpkg.com/three-cad-viewer", tpl)
+        self.assertContents(
+            self.template_path,
+            required=[
+                b"/assets/js/vendor/three-cad-viewer.esm.js",
+                # CSS should be loaded from vendor folder as well
+                b"/assets/css/vendor/three-cad-viewer.css",
+            ],
+            forbidden=[
+                b"three-cad-viewer@latest",
+                b"https://unpkg.com/three-cad-viewer",
+            ],
+        )
 
 
 if __name__ == '__main__':
@@ -1,17 +1,22 @@
+import gzip
+import http.client
 import json
 import os
 import re
+import shutil
 import socket
 import threading
 import time
 import urllib.request
 from http.server import ThreadingHTTPServer
+from unittest import mock
 
 import unittest
 
 import os, sys
 sys.path.insert(0, os.getcwd())
 import main
+from three_d_resume import server as server_mod
 
 
 class Server:
@@ -66,16 +71,17 @@ class IntegrationServerTest(unittest.TestCase):
     def setUp(self):
         # Backup resume.json
         self.resume_path = os.path.join(os.getcwd(), "resume.json")
-        self._original_resume = None
+        self._backup = None
         if os.path.exists(self.resume_path):
-            with open(self.resume_path, "r", encoding="utf-8") as f:
-                self._original_resume = f.read()
+            self._backup = self.resume_path + ".bak"
+            shutil.copyfile(self.resume_path, self._backup)
 
     def tearDown(self):
-        # Restore resume.json
-        if self._original_resume is not None:
-            with open(self.resume_path, "w", encoding="utf-8") as f:
-                f.write(self._original_resume)
+        # Restore resume.json, or remove the one the test wrote if there was none before
+        if self._backup is not None:
+            os.replace(self._backup, self.resume_path)
+        elif os.path.exists(self.resume_path):
+            os.remove(self.resume_path)
 
     def test_server_serves_rendered_resume_and_assets(self):
         # Prepare a sample resume.json
@@ -151,6 +157,77 @@ class IntegrationServerTest(unittest.TestCase):
         finally:
             srv.stop()
 
+    def test_unchanged_sources_reuse_generated_page(self):
+        with open(self.resume_path, "w", encoding="utf-8") as f:
+            json.dump({"basics": {"name": "Cache One"}}, f)
+        first = main.ensure_page_exists(force=True)
+        first_mtime = os.stat(first).st_mtime_ns
+
+        # Same sources: the existing page is returned untouched
+        self.assertEqual(main.ensure_page_exists(), first)
+        self.assertEqual(os.stat(first).st_mtime_ns, first_mtime)
+        # ... and its content is held in memory for the index route
+        with open(first, "rb") as f:
+            self.assertEqual(main.get_cached_page_bytes(first), f.read())
+
+        # Changed resume.json: the page is rendered again from the new content. The size
+        # differs too, so the change is seen even where two quick writes share an mtime.
+        with open(self.resume_path, "w", encoding="utf-8") as f:
+            json.dump({"basics": {"name": "Cache Number Two"}}, f)
+        second = main.ensure_page_exists()
+        with open(second, "r", encoding="utf-8") as f:
+            self.assertIn("Cache Number Two", f.read())
+
+
+class ContentEncodingTest(unittest.TestCase):
+    def setUp(self):
+        # Negotiation results are cached per header value and depend on whether brotli is present
+        server_mod._accepted_encodings.cache_clear()
+        self.addCleanup(server_mod._accepted_encodings.cache_clear)
+
+    def test_accept_encoding_q_values(self):
+        with mock.patch.object(server_mod, "brotli", object()):
+            self.assertEqual(server_mod._accepted_encodings("br, gzip"), ("br", "gzip"))
+            self.assertEqual(server_mod._accepted_encodings("br;q=0, gzip"), ("gzip",))
+            self.assertEqual(server_mod._accepted_encodings("*;q=0"), ())
+            # A malformed q-value counts as q=0
+            self.assertEqual(server_mod._accepted_encodings("gzip;q=abc, br"), ("br",))
+            self.assertEqual(server_mod._accepted_encodings("gzip;q=0.5, *"), ("br", "gzip"))
+
+    def test_without_brotli_only_gzip_is_offered(self):
+        with mock.patch.object(server_mod, "brotli", None):
+            self.assertEqual(server_mod._accepted_encodings("br, gzip"), ("gzip",))
+            self.assertEqual(server_mod._pick_encoding("br", 4096), "")
+
+    def test_small_bodies_skip_brotli(self):
+        with mock.patch.object(server_mod, "brotli", object()):
+            small = server_mod._BROTLI_MIN_SIZE - 1
+            self.assertEqual(server_mod._pick_encoding("br, gzip", small), "gzip")
+            self.assertEqual(server_mod._pick_encoding("br", small), "")
+            self.assertEqual(server_mod._pick_encoding("br, gzip", small + 1), "br")
+
+    def test_large_file_is_streamed_chunked(self):
+        path = os.path.join("assets", "js", "app.js")
+        with open(path, "rb") as f:
+            expected = f.read()
+        srv = Server()
+        # Lower the limit so the (small) app.js takes the streaming path
+        with mock.patch.object(server_mod, "_STREAM_LIMIT", len(expected) // 2):
+            try:
+                srv.start()
+                conn = http.client.HTTPConnection(srv.host, srv.port, timeout=5)
+                conn.request("GET", "/assets/js/app.js", headers={"Accept-Encoding": "gzip"})
+                resp = conn.getresponse()
+                body = resp.read()  # http.client removes the chunked framing
+                conn.close()
+            finally:
+                srv.stop()
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader("Transfer-Encoding"), "chunked")
+        self.assertEqual(resp.getheader("Content-Encoding"), "gzip")
+        self.assertIsNone(resp.getheader("Content-Length"))
+        self.assertEqual(gzip.decompress(body), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from three_d_resume import step_to_json  # noqa: E402
+
+
+class ParseJsObjectLiteralTest(unittest.TestCase):
+    # Every case runs through each decoder path: the strict-JSON fast path (orjson or
+    # json.raw_decode), pyjson5 when installed, and the regex rewrite on its own
+    BACKENDS = [
+        ('default', {'orjson': step_to_json.orjson}),
+        ('without orjson', {'orjson': None}),
+        ('regex rewrite only', {'orjson': None, 'pyjson5': None}),
+    ]
+
+    def assertParses(self, text, expected):
+        for label, overrides in self.BACKENDS:
+            with self.subTest(label), mock.patch.multiple(step_to_json, **overrides):
+                self.assertEqual(step_to_json._parse_js_object_literal(text), expected)
+
+    def test_strict_json_after_var(self):
+        self.assertParses('var data = {"version": 3, "parts": [1, 2]};',
+                          {'version': 3, 'parts': [1, 2]})
+
+    def test_bare_keys(self):
+        self.assertParses('var data = {version: 3, $name: "x", _id: 1};',
+                          {'version': 3, '$name': 'x', '_id': 1})
+
+    def test_trailing_commas(self):
+        self.assertParses('var data = {a: [1, 2, ], b: {c: 1, }, };', {'a': [1, 2], 'b': {'c': 1}})
+
+    def test_colon_and_brace_inside_string_value(self):
+        self.assertParses('var data = {name: "a: b }, c: d", n: 1};',
+                          {'name': 'a: b }, c: d', 'n': 1})
+
+    def test_export_const_prefix(self):
+        self.assertParses('export const shapes = {a: 1};', {'a': 1})
+
+    def test_trailing_text_after_object(self):
+        # The last '}' belongs to the trailing comment, so the fast path's slice is not JSON
+        self.assertParses('var data = {"a": {"b": 1}};\n// end of {data}\n', {'a': {'b': 1}})
+
+    def test_missing_object_raises(self):
+        with self.assertRaises(ValueError):
+            step_to_json._parse_js_object_literal('var data = 42;')
+
+
+if __name__ == '__main__':
+    unittest.main()
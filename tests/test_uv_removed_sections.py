@@ -1,96 +1,196 @@
+import hashlib
+import importlib.util
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+import tempfile
 import unittest
 
+try:
+    import orjson
+except ImportError:  # optional: faster resume.json round-trips
+    orjson = None
+
+# Resolved from this file, so tests do not depend on (or race over) the working directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_PATH = os.path.join(REPO_ROOT, 'resume.json')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+# Resolved once: PATH is walked at import, not per test
+_UV_PATH = shutil.which('uv')
+# Small, explicit environment for the uv child: what uv needs to find its cache and
+# toolchain, reach the network when it syncs the project (proxies, CA certificates) and
+# decode output, without the rest of the test runner's env
+_UV_ENV_KEYS = frozenset({
+    'PATH', 'HOME', 'TMPDIR', 'TEMP', 'TMP', 'SYSTEMROOT', 'VIRTUAL_ENV', 'LANG',
+    'SSL_CERT_FILE', 'SSL_CERT_DIR',
+    'HTTP_PROXY', 'HTTPS_PROXY', 'ALL_PROXY', 'NO_PROXY',
+    'http_proxy', 'https_proxy', 'all_proxy', 'no_proxy',
+})
+_UV_ENV = {
+    k: v for k, v in os.environ.items()
+    if k in _UV_ENV_KEYS or k.startswith(('UV_', 'XDG_', 'LC_'))
+}
+_UV_ENV.update(PYTHONDONTWRITEBYTECODE='1', PYTHONNOUSERSITE='1')
+
 
 class UvRemovedSectionsTest(unittest.TestCase):
-    def setUp(self):
-        self.repo_root = os.getcwd()
-        self.resume_path = os.path.join(self.repo_root, 'resume.json')
-        with open(self.resume_path, 'r', encoding='utf-8') as f:
-            self._orig_resume = f.read()
+    # Each test renders in its own workspace (resume.json + page/ in a temp dir, assets
+    # linked from the repo), so the tests share no files and can run in parallel shards,
+    # e.g. with pytest -n 2.
+    @classmethod
+    def setUpClass(cls):
+        # Skip the whole class up front when this checkout cannot render a page;
+        # find_spec locates the module without executing it
+        try:
+            server_spec = importlib.util.find_spec('three_d_resume.server')
+        except ImportError:
+            server_spec = None
+        if server_spec is None:
+            raise unittest.SkipTest('three_d_resume.server is not importable')
+        if not os.path.isfile(RESUME_PATH):
+            raise unittest.SkipTest(f'{RESUME_PATH} does not exist')
+        from three_d_resume import server
+        cls._server = server
+
+        # The repo's resume.json is only read, so load and parse it once for all tests
+        with open(RESUME_PATH, 'rb') as f:
+            raw = f.read()
+        cls._orig_data = orjson.loads(raw) if orjson else json.loads(raw)
+        # Serialized resume.json per references variant; the ones the tests use are
+        # encoded here so no JSON work happens inside the tests
+        cls._resume_blobs = {}
+        for references_value in ([], None):
+            cls._resume_blob(references_value)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Renders fill the generator's module-level caches; leave none behind for other tests
+        cls._server._clear_caches()
 
-    def tearDown(self):
-        # Restore original resume.json
-        with open(self.resume_path, 'w', encoding='utf-8') as f:
-            f.write(self._orig_resume)
+    @classmethod
+    def _resume_blob(cls, references_value):
+        key = json.dumps(references_value)
+        blob = cls._resume_blobs.get(key)
+        if blob is None:
+            # Only a top-level key changes, so a shallow copy keeps the cached data intact
+            data = dict(cls._orig_data)
+            if references_value is None:
+                # Remove key entirely if present
+                data.pop('references', None)
+            else:
+                data['references'] = references_value
+            blob = orjson.dumps(data) if orjson else json.dumps(data).encode('utf-8')
+            cls._resume_blobs[key] = blob
+        return blob
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix='uv-sections-')
+        self.addCleanup(shutil.rmtree, self.workdir, ignore_errors=True)
+        assets = os.path.join(REPO_ROOT, 'assets')
+        try:
+            os.symlink(assets, os.path.join(self.workdir, 'assets'), target_is_directory=True)
+        except OSError:
+            shutil.copytree(assets, os.path.join(self.workdir, 'assets'))
+        self.resume_path = os.path.join(self.workdir, 'resume.json')
+        self.pages_dir = os.path.join(self.workdir, 'page')
 
     def _write_resume_with_refs(self, references_value):
-        data = json.loads(self._orig_resume)
-        if references_value is None:
-            # Remove key entirely if present
-            if 'references' in data:
-                del data['references']
-        else:
-            data['references'] = references_value
-        with open(self.resume_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
+        raw = self._resume_blob(references_value)
+        # Publish atomically so the generator never sees a half-written file
+        tmp_path = f'{self.resume_path}.tmp.{os.getpid()}'
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, self.resume_path)
+        return raw
 
-    def _generate_with_uv(self):
-        # Prefer uv if available; otherwise, skip test (requirement is to use uv)
-        uv_path = shutil.which('uv')
-        if not uv_path:
-            self.skipTest('uv is not installed in this environment')
-        # Use uv to run a short python -c that prints only the generated path
-        code = (
-            'import os, sys;'
-            'sys.path.insert(0, os.path.join(os.getcwd(), "src"));'
-            'from three_d_resume.server import generate_page_from_template;'
-            'print(generate_page_from_template())'
+    def _generate(self):
+        # Render in-process from the workspace, by absolute paths rather than the cwd
+        return self._server.generate_page_from_resume(
+            self.resume_path, self.pages_dir, root=self.workdir
         )
-        proc = subprocess.run(
-            [uv_path, 'run', 'python', '-c', code],
-            cwd=self.repo_root,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-        )
-        # Find a line that looks like a generated html path
-        out_lines = [ln.strip() for ln in proc.stdout.splitlines() if ln.strip()]
-        # Prefer the last line which should be the printed return value
-        if not out_lines:
-            self.fail(f'No output from uv run; stderr=\n{proc.stderr}')
-        candidate = out_lines[-1]
-        # If the last line is not an existing file, try to search any line ending with .html
-        if not (candidate.endswith('.html') and os.path.exists(candidate)):
-            for ln in reversed(out_lines):
-                if ln.endswith('.html') and os.path.exists(ln):
-                    candidate = ln
-                    break
-        self.assertTrue(candidate.endswith('.html') and os.path.exists(candidate),
-                        f'Could not determine generated page path from output. stdout=\n{proc.stdout}\nstderr=\n{proc.stderr}')
-        return candidate
-
-    def _assert_references_section_absent(self, html):
-        self.assertNotIn('<section id="references"', html)
-        self.assertNotIn('<h2>Referenzen</h2>', html)
-
-    def _assert_some_other_sections_present(self, html):
-        # Ensure the page still has other content (sanity)
-        self.assertIn('<section id="skills"', html)
-        self.assertIn('<h2>Fähigkeiten</h2>', html)
-
-    def test_removed_references_array_results_in_no_section(self):
-        # Case 1: references exists but is empty
-        self._write_resume_with_refs([])
-        page_path = self._generate_with_uv()
-        with open(page_path, 'r', encoding='utf-8') as f:
-            html = f.read()
-        self._assert_references_section_absent(html)
-        self._assert_some_other_sections_present(html)
 
-    def test_missing_references_key_results_in_no_section(self):
-        # Case 2: references key removed entirely
-        self._write_resume_with_refs(None)
+    def _generate_with_uv(self):
+        # Use uv to run a short python -c whose stdout is exactly the generated path:
+        # build logs go to stderr, then the path is written as the single stdout line
+        code = '\n'.join([
+            'import contextlib, sys',
+            f'sys.path.insert(0, {os.path.join(REPO_ROOT, "src")!r})',
+            'from three_d_resume.server import generate_page_from_resume',
+            'with contextlib.redirect_stdout(sys.stderr):',
+            f'    page = generate_page_from_resume({self.resume_path!r}, {self.pages_dir!r},'
+            f' root={self.workdir!r})',
+            'sys.stdout.write(page + "\\n")',
+        ])
+        # stdout is only the path, kept as bytes; stderr (build logs) is spooled to a
+        # temp file and decoded only if the run fails
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.run(
+                [_UV_PATH, 'run', '--project', REPO_ROOT, 'python', '-I', '-c', code],
+                cwd=self.workdir,
+                env=_UV_ENV,
+                # no other descriptors worth protecting are open; skip the fd sweep
+                close_fds=False,
+                stdout=subprocess.PIPE,
+                stderr=err,
+            )
+            page_path = os.fsdecode(proc.stdout.strip())
+            page_ok = page_path.endswith('.html') and os.path.isfile(page_path)
+            if proc.returncode != 0 or not page_ok:
+                err.seek(0)
+                self.fail(f'uv run failed (exit {proc.returncode}). stdout=\n{page_path}\n'
+                          f'stderr=\n{err.read().decode("utf-8", "replace")}')
+        return page_path
+
+    # The page is checked as raw bytes; needles are UTF-8 encoded to match
+    _ABSENT = (b'<section id="references"', b'<h2>Referenzen</h2>')
+    # Ensure the page still has other content (sanity)
+    _PRESENT = (b'<section id="skills"', '<h2>Fähigkeiten</h2>'.encode('utf-8'))
+    # All needles in one alternation, so each page is scanned once
+    _NEEDLES_RE = re.compile(b'|'.join(re.escape(n) for n in _ABSENT + _PRESENT))
+
+    def _assert_sections(self, html):
+        found = {m.group() for m in self._NEEDLES_RE.finditer(html)}
+        leaked = found.intersection(self._ABSENT)
+        missing = set(self._PRESENT).difference(found)
+        if leaked or missing:
+            self.fail(f'leaked: {sorted(leaked)}, missing: {sorted(missing)}')
+
+    # Rendered HTML per resume.json content, shared by all cases in the class
+    _html_by_resume = {}
+
+    def _render_html(self, references_value):
+        raw = self._write_resume_with_refs(references_value)
+        key = hashlib.sha1(raw).hexdigest()
+        html = self._html_by_resume.get(key)
+        if html is None:
+            with open(self._generate(), 'rb') as f:
+                html = self._html_by_resume[key] = f.read()
+        return html
+
+    def test_references_section_absent(self):
+        cases = [
+            # Case 1: references exists but is empty
+            ('empty references array', []),
+            # Case 2: references key removed entirely
+            ('references key removed', None),
+        ]
+        for label, references_value in cases:
+            with self.subTest(label):
+                html = self._render_html(references_value)
+                self._assert_sections(html)
+
+    @unittest.skipUnless(_UV_PATH, 'uv is not installed in this environment')
+    def test_generation_through_uv_project_env(self):
+        # The page must also render through `uv run` in the project environment
+        self._write_resume_with_refs([])
         page_path = self._generate_with_uv()
-        with open(page_path, 'r', encoding='utf-8') as f:
+        with open(page_path, 'rb') as f:
             html = f.read()
-        self._assert_references_section_absent(html)
-        self._assert_some_other_sections_present(html)
+        self._assert_sections(html)
 
 
 if __name__ == '__main__':